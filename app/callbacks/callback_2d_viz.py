@@ -37,7 +37,8 @@ from app.core.state import get_app_data
 # app functions
 from app.helper.helper__app_data import (filter_satellite_data)
 # app helper functions
-from app.helper.helper__plot_display import (create_2d_scatter_plot, create_2d_figure)
+from app.helper.helper__plot_display import create_2d_figure_patch
+from app.helper.helper__orbit_path_cache import get_ground_track_update
 
 
 # Callback wrapper function
@@ -51,8 +52,13 @@ def register(app):
     # Get app data
     app_data = get_app_data()
     df = app_data['data']['satcat_df']
+    satrec_store = app_data['data']['satrec_store']
+    position_cache = app_data['data']['position_cache']
     input_filter = app_data['filter']['initial_filter']
-    layout_2d = app_data['viz_2d']['layout']
+    filter_index = app_data['filter']['filter_index']
+    filter_cache = app_data['filter']['filter_cache']
+    filter_session_store = app_data['filter']['filter_session_store']
+    ground_track_cache = app_data['viz_2d']['ground_track_cache']
 
 
     # >>> Define Callbacks <<<
@@ -62,11 +68,15 @@ def register(app):
     2d visualisation 
     -------------------------
     Interactive Inputs: Filter dropdowns, Launch year slider, update time button, interval-timer
-    Outputs: 2d orbit path scatter plot
+    Outputs: 2d orbit path scatter plot (partial figure updates - the ground track is only sent when it is extended
+             or replaced, otherwise only the current position marker is moved)
     '''
 
     @app.callback(
-        Output('2d-earth-satellite-plot', 'figure'),
+        [
+            Output('2d-earth-satellite-plot', 'figure'),
+            Output('2d-track-memory', 'data')
+        ],
         [
             Input('status-filter-checkbox', 'value'),
             Input('orbit-filter-checkbox', 'value'),
@@ -79,27 +89,44 @@ def register(app):
             Input("sat-viz-tabs", "active_tab"),
             Input("time-update-btn", "n_clicks"),
             Input('2d-viz-interval-component', "n_intervals")
-        ]
+        ],
+        State('session-id', 'data'),
+        State('2d-track-memory', 'data')
     )
     def update_2dviz(status, orbit, satname, satcatid,
                      owner, launchvehicle,
-                     purpose, year, tab, update_time_btn, time_intverval):
+                     purpose, year, tab, update_time_btn, time_intverval,
+                     session_id, track_mem):
 
         if tab != "2d-viz":
             raise PreventUpdate
         elif tab == "2d-viz":
 
             # Filter data using helper
-            dff, time_now, _ = filter_satellite_data(df, input_filter,
+            sat_result = filter_satellite_data(df, input_filter,
                                                           status, orbit, satname, 
                                                           satcatid, owner, 
-                                                          launchvehicle, purpose, year)
+                                                          launchvehicle, purpose, year,
+                                                          position_cache=position_cache,
+                                                          filter_index=filter_index,
+                                                          filter_cache=filter_cache,
+                                                          filter_session_store=filter_session_store,
+                                                          session_id=session_id)
 
             ## 2D Visualisation
-            # Create 2D orbit path scatter plot
-            scatter_plots = create_2d_scatter_plot(dff, time_now)
-            # Create 2D figure
-            fig_2d = create_2d_figure(layout_2d, scatter_plots)
-
-
-            return fig_2d
+            # Ground track is only shown for a single satellite
+            if len(sat_result['index']) != 1:
+                if track_mem is None:
+                    raise PreventUpdate
+                return create_2d_figure_patch(), None
+
+            # Ground track samples missing from client (cached per satellite and TLE epoch, extended lazily)
+            row = sat_result['index'][0]
+            ground_track, track_mem = get_ground_track_update(ground_track_cache, satrec_store,
+                                                              int(df["SatCatId"].values[row]),
+                                                              float(df["OrbitalPeriod"].values[row]),
+                                                              3600, sat_result['time'], track_mem)
+            # Patch 2D figure on client
+            fig_2d = create_2d_figure_patch(sat_result, ground_track)
+
+            return fig_2d, track_mem
@@ -38,11 +38,13 @@ sys.path.append("../../")
 # app data
 from app.core.state import get_app_data
 # app functions
-from app.helper.helper__app_data import (filter_satellite_data)
+from app.helper.helper__app_data import (filter_satellite_data, get_satellite_columns, create_filter_breakdown)
 # app helper functions
-from app.helper.helper__plot_display import (create_3d_scatter_plot, create_3d_figure, 
-                                            annotate_3d_figure, update_3d_camera_view,
-                                            add_orbit_paths_to_figure, handle_orbit_click)
+from app.helper.helper__plot_display import (create_3d_scatter_plot, create_3d_annotation, get_3d_camera_view,
+                                            create_3d_orbit_path_traces, create_3d_figure_patch,
+                                            handle_orbit_click)
+# user config
+from app.config.user_setup_app import hover_mode_3d
 
 
 # Callback wrapper function
@@ -58,10 +60,15 @@ def register(app):
     # Get app data
     app_data = get_app_data()
     df = app_data['data']['satcat_df']
+    satrec_store = app_data['data']['satrec_store']
+    position_cache = app_data['data']['position_cache']
     input_filter = app_data['filter']['initial_filter']
-    surf_3d = app_data['viz_3d']['surface']
-    layout_3d = app_data['viz_3d']['layout']
+    filter_index = app_data['filter']['filter_index']
+    filter_cache = app_data['filter']['filter_cache']
+    filter_session_store = app_data['filter']['filter_session_store']
     fig3d_0 = app_data['viz_3d']['base_figure']
+    hover_text_index = app_data['viz_3d']['hover_text_index']
+    orbit_path_cache = app_data['viz_3d']['orbit_path_cache']
 
     # >>> Define Callbacks <<<
 
@@ -70,14 +77,16 @@ def register(app):
     3d visualisation 
     -------------------------
     Interactive Inputs: Filter dropdowns, Launch year slider, plot clicks, update time button, interval-timer
-    Outputs: 3d Satellite scatter plot, 3d orbit line plot, camera view
+    Outputs: 3d Satellite scatter plot, 3d orbit line plot, camera view (partial figure updates - the Earth surface
+             and layout are only sent with the page)
     '''
 
     @app.callback(
         [
             Output('3d-earth-satellite-plot', 'figure'),
             Output('3d-orbit-memory', 'data'),
-            Output('camera-memory', "data")
+            Output('camera-memory', "data"),
+            Output('3d-trace-count', 'data')
         ],
         [
             Input('status-filter-checkbox', 'value'),
@@ -95,39 +104,59 @@ def register(app):
             Input('3d-viz-interval-component', "n_intervals")
         ],
         State('camera-memory', "data"),
-        State('3d-earth-satellite-plot', 'relayoutData')
+        State('3d-earth-satellite-plot', 'relayoutData'),
+        State('session-id', 'data'),
+        State('3d-trace-count', 'data')
     )
     def update_3dviz(status, orbit, satname, satcatid,
                      owner, launchvehicle, purpose, year,
                      clickData, orbit_list, tab,
                      clear_orbits_btn, time_interval, 
-                     cam_mem, cam_scene):
+                     cam_mem, cam_scene, session_id, trace_count):
 
         if tab != "3d-viz":
             raise PreventUpdate
         elif tab == "3d-viz":
             # Filter data using helper
-            dff, time_now, sat_status_enc = filter_satellite_data(df, input_filter,
+            sat_result = filter_satellite_data(df, input_filter,
                                                           status, orbit, satname, 
                                                           satcatid, owner, 
-                                                          launchvehicle, purpose, year)
+                                                          launchvehicle, purpose, year,
+                                                          position_cache=position_cache,
+                                                          filter_index=filter_index,
+                                                          filter_cache=filter_cache,
+                                                          filter_session_store=filter_session_store,
+                                                          session_id=session_id)
+
+            # Catalogue columns of filtered satellites (shared dataframe is not copied)
+            sat_columns = get_satellite_columns(df, sat_result, ["ObjectName", "SatCatId", "Status", "OrbitClass",
+                                                                 "LaunchYear", "Owner"])
 
             # Update orbit list based on clicks
-            orbit_list_updated = handle_orbit_click(callback_context, clickData, orbit_list, dff)                                                          
+            orbit_list_updated = handle_orbit_click(callback_context, clickData, orbit_list, sat_columns["SatCatId"])
 
-            ## Generate 3d figure
+            ## Generate 3d figure update
 
             # Create scatter plot for active/inactive satellites
-            scatter_3d = create_3d_scatter_plot(dff, sat_status_enc)
-            # Create base 3d figure
-            fig_3d = create_3d_figure(layout_3d, surf_3d, scatter_3d)
-            # Annotate 3d figure
-            fig_3d = annotate_3d_figure(fig_3d, dff, time_now)
-
-            # Update 3d camera view
-            fig_3d, cam_mem = update_3d_camera_view(cam_mem, cam_scene, fig_3d)
-
-            # Add orbit paths to figure
-            fig_3d = add_orbit_paths_to_figure(fig_3d, dff, orbit_list_updated, time_now)
+            scatter_3d = create_3d_scatter_plot(sat_columns, sat_result, hover_text_index, hover_mode_3d)
+            # Annotation of 3d figure
+            status_breakdown = create_filter_breakdown(df, input_filter,
+                                                       status, orbit, satname,
+                                                       satcatid, owner,
+                                                       launchvehicle, purpose, year,
+                                                       "Status", filter_index=filter_index)
+            annotation_3d = create_3d_annotation(sat_result, status_breakdown)
+
+            # 3d camera view
+            camera_3d, cam_mem = get_3d_camera_view(cam_mem, cam_scene, fig3d_0["layout"]["scene"]["camera"])
+
+            # Orbit paths (cached inertial paths rotated to current time)
+            orbit_traces = create_3d_orbit_path_traces(df, sat_result, sat_columns["SatCatId"], orbit_list_updated,
+                                                       hover_text_index, satrec_store, hover_mode_3d,
+                                                       orbit_path_cache)
+
+            # Patch 3d figure on client (Earth surface and layout are not re-sent)
+            fig_patch, trace_count = create_3d_figure_patch(scatter_3d, orbit_traces, annotation_3d, camera_3d,
+                                                            trace_count)
             
-            return fig_3d, orbit_list_updated, cam_mem
+            return fig_patch, orbit_list_updated, cam_mem, trace_count
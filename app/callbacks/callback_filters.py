@@ -14,6 +14,7 @@ Functions:
     update_2dviz: callback function for interactive 2d satellite visualisation
     update_tbl: callback function for table of satellites
     update_dropdown: callback function for satellite name and satcat number dynamic filter dropdown options
+    update_url_query: callback function for filter query string of page URL
 
 Todo:
     * 
@@ -38,8 +39,11 @@ sys.path.append("../../")
 # app data
 from app.core.state import get_app_data
 # app functions
-from app.helper.helper__app_data import (filter_satellite_data)
-from app.helper.helper__filter_display import (sort_filter_dropdown_options, format_year_slider_output)
+from app.helper.helper__app_data import (select_satellite_rows)
+from app.helper.helper__filter_display import (search_filter_dropdown_options, format_year_slider_output)
+from app.helper.helper__filter_query import encode_filter_query
+# user config
+from app.config.user_setup_app import dropdown_search_limit
 
 
 # Callback wrapper function
@@ -55,6 +59,11 @@ def register(app):
     app_data = get_app_data()
     df = app_data['data']['satcat_df']
     input_filter = app_data['filter']['initial_filter']
+    filter_index = app_data['filter']['filter_index']
+    filter_cache = app_data['filter']['filter_cache']
+    filter_session_store = app_data['filter']['filter_session_store']
+    dropdown_index = app_data['filter']['dropdown_index']
+    options = app_data['filter']['options']
 
     # >>> Define Callbacks <<<
 
@@ -62,8 +71,8 @@ def register(app):
     ------------------------
     Dynamic dropdown 
     -------------------------
-    Interactive Inputs: Filter dropdowns, Launch year slider
-    Outputs: Satellite name and SATCAT number filter dropdown options
+    Interactive Inputs: Filter dropdowns, Launch year slider, dropdown search values
+    Outputs: Satellite name and SATCAT number filter dropdown options (top matches of search value)
     '''
 
     @app.callback(
@@ -81,33 +90,78 @@ def register(app):
             Input('owner-filter-multi-dropdown', 'value'),
             Input('launchvehicle-filter-multi-dropdown', 'value'),
             Input('purpose-filter-multi-dropdown', 'value'),
-            Input('launchyear-filter-slider', 'value')
-        ]
+            Input('launchyear-filter-slider', 'value'),
+            Input('satname-filter-dropdown', 'search_value'),
+            Input('satcatid-filter-dropdown', 'search_value')
+        ],
+        State('session-id', 'data')
     )
     def update_dropdown(status, orbit, satname, satcatid,
                         owner, launchvehicle,
-                        purpose, year):
-
-        # Filter data using helper
-        dff, _, _ = filter_satellite_data(df, input_filter,
-                                        status, orbit, satname, satcatid,
-                                        owner, launchvehicle, purpose, year)
-        if dff.shape[0] == 0:
+                        purpose, year, satname_search, satcatid_search, session_id):
+
+        # Select matching rows using helper (metadata only - no propagation)
+        row_index = select_satellite_rows(df, input_filter,
+                                          status, orbit, satname, satcatid,
+                                          owner, launchvehicle, purpose, year,
+                                          filter_index=filter_index,
+                                          filter_cache=filter_cache,
+                                          filter_session_store=filter_session_store,
+                                          session_id=session_id)
+        if len(row_index) == 0:
             satname = None
             satcatid = None
-            dff, _, _ = filter_satellite_data(df, input_filter,
-                                        status, orbit, satname, satcatid,
-                                        owner, launchvehicle, purpose, year)
-        else:
-            dff, _, _ = filter_satellite_data(df, input_filter,
-                                        status, orbit, satname, satcatid,
-                                        owner, launchvehicle, purpose, year)
+            row_index = select_satellite_rows(df, input_filter,
+                                              status, orbit, satname, satcatid,
+                                              owner, launchvehicle, purpose, year,
+                                              filter_index=filter_index,
+                                              filter_cache=filter_cache,
+                                              filter_session_store=filter_session_store,
+                                              session_id=session_id)
         
         # Format dropdown options
-        satname_options, satcatid_options = sort_filter_dropdown_options(dff)
+        satname_options = search_filter_dropdown_options(dropdown_index, "ObjectName", row_index, satname_search,
+                                                         dropdown_search_limit, satname)
+        satcatid_options = search_filter_dropdown_options(dropdown_index, "SatCatId", row_index, satcatid_search,
+                                                          dropdown_search_limit, satcatid)
 
         return satname_options, satcatid_options, satname, satcatid
 
+    '''
+    ------------------------
+    URL filter query
+    -------------------------
+    Interactive Inputs: Filter dropdowns, Launch year slider
+    Outputs: Filter query string of page URL (shareable link to current filter selection)
+    '''
+
+    @app.callback(
+        Output('url', 'search'),
+        [
+            Input('status-filter-checkbox', 'value'),
+            Input('orbit-filter-checkbox', 'value'),
+            Input('satname-filter-dropdown', 'value'),
+            Input('satcatid-filter-dropdown', 'value'),
+            Input('owner-filter-multi-dropdown', 'value'),
+            Input('launchvehicle-filter-multi-dropdown', 'value'),
+            Input('purpose-filter-multi-dropdown', 'value'),
+            Input('launchyear-filter-slider', 'value')
+        ],
+        State('url', 'search')
+    )
+    def update_url_query(status, orbit, satname, satcatid, owner, launchvehicle, purpose, year, search):
+
+        filter_inputs = dict(status=status or [], orbit=orbit or [], satname=satname, satcatid=satcatid,
+                             owner=owner or [], launchvehicle=launchvehicle or [], purpose=purpose or [], year=year)
+        query = encode_filter_query(filter_inputs, options)
+        search_updated = f"?{query}" if query else ""
+
+        # Skip update (and browser history entry) if URL already matches
+        if search_updated == (search or ""):
+            raise PreventUpdate
+
+        return search_updated
+
     '''------------------------
     Mobile responsiveness
     -------------------------
@@ -54,7 +54,11 @@ def register(app):
     # Get app data
     app_data = get_app_data()
     df = app_data['data']['satcat_df']
+    position_cache = app_data['data']['position_cache']
     input_filter = app_data['filter']['initial_filter']
+    filter_index = app_data['filter']['filter_index']
+    filter_cache = app_data['filter']['filter_cache']
+    filter_session_store = app_data['filter']['filter_session_store']
 
     # >>> Define Callbacks <<<
     '''
@@ -78,22 +82,28 @@ def register(app):
             Input('launchyear-filter-slider', 'value'),
             Input("sat-viz-tabs", "active_tab"),
             Input("time-update-btn", "n_clicks")
-        ]
+        ],
+        State('session-id', 'data')
     )
     def update_tbl(status, orbit, satname, satcatid,
                    owner, launchvehicle,
-                   purpose, year, tab, update_time_btn):
+                   purpose, year, tab, update_time_btn, session_id):
 
         if tab != "tbl-viz":
             raise PreventUpdate
         elif tab == "tbl-viz":
 
             # Filter data using helper
-            dff, time_now, _ = filter_satellite_data(df, input_filter,
+            sat_result = filter_satellite_data(df, input_filter,
                                                           status, orbit, satname,
                                                             satcatid, owner,
-                                                            launchvehicle, purpose, year)
+                                                            launchvehicle, purpose, year,
+                                                            position_cache=position_cache,
+                                                            filter_index=filter_index,
+                                                            filter_cache=filter_cache,
+                                                            filter_session_store=filter_session_store,
+                                                            session_id=session_id)
             # Table output
-            table_data = format_table_data(dff, time_now)
+            table_data = format_table_data(df, sat_result)
 
             return table_data
@@ -24,3 +24,69 @@ Todo:
 satcat_loc = "https://raw.githubusercontent.com/pseud-acc/SatTrack/refs/heads/main/dat/clean/satcat_tle.csv"
 img_loc = "./assets/images/gray_scale_earth_2048_1024.jpg"
 metadata_loc = "https://raw.githubusercontent.com/pseud-acc/SatTrack/refs/heads/main/dat/meta/last_data_update.csv"
+
+"""
+    Position Snapshot Cache
+"""
+position_cache_resolution = 1 # epoch resolution (seconds) - callbacks within the same interval share one propagation
+position_cache_max_size = 8 # maximum number of snapshots held in memory
+position_cache_ttl = 60 # time (seconds) before a snapshot is evicted
+
+"""
+    Background Position Producer
+"""
+position_producer_enabled = True # propagate full catalogue in a background thread while visualisations are requested (callbacks read latest snapshot)
+position_producer_cadence = 1 # time (seconds) between propagation runs
+position_producer_idle_timeout = 60 # time (seconds) without position requests before the background thread stops
+
+"""
+    Orbit Path Cache
+"""
+orbit_path_cache_max_bytes = 8_000_000 # maximum memory (bytes) of 3D orbit paths (~17kB each) and, separately, of 2D ground tracks (up to ~260kB each) held in memory
+orbit_path_cache_ttl = 3600 # time (seconds) before a path is re-propagated (bounds drift of the inertial orbit, e.g. precession)
+
+"""
+    Filter Result Cache
+"""
+filter_cache_max_size = 128 # maximum number of filter results (selected rows per filter combination) held in memory
+
+"""
+    Filter Sessions
+"""
+filter_session_max_sessions = 256 # maximum number of browser sessions with per-dimension filter masks held in memory
+filter_session_ttl = 1800 # time (seconds) a session may be idle before its filter masks are evicted
+
+"""
+    3D Hover Labels
+"""
+hover_mode_3d = "text" # "text" - HTML hover text per marker, "template" - per-marker values in customdata with one shared hovertemplate (~10x smaller figure) (see benchmark in helper__plot_display.py)
+
+"""
+    Filter Presets
+"""
+filter_presets = { # filter query per preset name - rows precomputed at startup, shared as ?preset=<name> (see helper__filter_query.py)
+    "active-leo": "status=Active&orbit=LEO",
+    "active-geo": "status=Active&orbit=GEO,GSO",
+    "communications": "status=Active&orbit=LEO,MEO,GEO,GSO,HEO&purpose=Communications",
+    "navigation": "status=Active&orbit=MEO,GEO,GSO&purpose=Navigation (Global or Regional Positioning)",
+}
+
+"""
+    Dropdown Search
+"""
+dropdown_search_limit = 50 # maximum number of satellite name/SATCAT number options sent per dropdown search
+
+"""
+    Chebyshev Ephemeris
+"""
+ephemeris_enabled = False # fit full-catalogue Chebyshev ephemeris at startup (takes several seconds for ~20k satellites)
+ephemeris_window = 6 # rolling window length (hours)
+ephemeris_segment = 30 # polynomial segment length (minutes)
+ephemeris_degree = 13 # polynomial degree of each segment
+ephemeris_tolerance = 0.01 # maximum position error against SGP4 (km) - satellites above tolerance fall back to SGP4
+
+"""
+    Process-Pool Propagation
+"""
+propagation_workers = 0 # number of worker processes for full-catalogue propagation (0 = single process)
+propagation_parallel_threshold = 50000 # minimum catalogue size for process-pool propagation (see benchmark in helper__parallel_propagation.py)
@@ -12,6 +12,11 @@ Functions:
     import_data: Import satellite data and earth map
     initialise_app_data: Run functions to initialise app
     get_app_data: Get cached app data
+    get_position_producer_status: Get background position producer monitoring statistics
+    get_filter_cache_status: Get filter result cache monitoring statistics
+    get_filter_session_status: Get per-session filter mask monitoring statistics
+    get_orbit_path_cache_status: Get orbit path cache monitoring statistics
+    get_ground_track_cache_status: Get ground track cache monitoring statistics
     clear_app_data_cache: Clear cached app data
 Todo:
     *
@@ -19,6 +24,7 @@ Todo:
 """
 ## Packages
 import pandas as pd
+from datetime import datetime
 import sys
 import numpy as np
 from PIL import Image
@@ -26,13 +32,36 @@ from PIL import Image
 ## Internal Modules
 sys.path.append("../../")
 # user config
-from app.config.user_setup_app import (satcat_loc, img_loc, metadata_loc)
+from app.config.user_setup_app import (satcat_loc, img_loc, metadata_loc, position_cache_resolution,
+                                       position_cache_max_size, position_cache_ttl,
+                                       position_producer_enabled, position_producer_cadence,
+                                       position_producer_idle_timeout,
+                                       orbit_path_cache_max_bytes, orbit_path_cache_ttl,
+                                       ephemeris_enabled, ephemeris_window, ephemeris_segment,
+                                       ephemeris_degree, ephemeris_tolerance,
+                                       propagation_workers, propagation_parallel_threshold,
+                                       filter_cache_max_size, filter_session_max_sessions, filter_session_ttl,
+                                       dropdown_search_limit, filter_presets)
 # helper scripts
 from app.helper.helper__constants import _resolution_3d_earth_map__c
-from app.helper.helper__plot_display import (create_3d_layout, create_3d_surface, create_3d_figure, 
-                                             create_2d_layout, create_2d_figure)
+from app.helper.helper__plot_display import (create_3d_layout, create_3d_surface, create_3d_figure,
+                                             create_3d_hover_text_index, create_2d_layout, create_2d_figure)
 from app.helper.helper__table_display import create_table_mapping
-from app.helper.helper__app_data import create_data_filters
+from app.helper.helper__app_data import create_data_filters, compact_satcat
+from app.helper.helper__filter_query import create_filter_presets
+from app.helper.helper__filter_display import create_filter_dropdown_index, create_filter_search_index
+from app.helper.helper__filter_session import (create_filter_session_store, clear_filter_sessions,
+                                               get_filter_session_stats)
+from app.helper.helper__filter_index import (create_filter_index, create_filter_cache, clear_filter_cache,
+                                             get_filter_cache_stats)
+from app.helper.helper__satellite_position import create_satrec_store, datetime64_to_jday
+from app.helper.helper__ephemeris import fit_chebyshev_ephemeris
+from app.helper.helper__parallel_propagation import create_propagation_pool, close_propagation_pool
+from app.helper.helper__orbit_path_cache import (create_orbit_path_cache, clear_orbit_path_cache,
+                                                 get_orbit_path_cache_stats)
+from app.helper.helper__position_cache import (create_position_cache, create_position_producer,
+                                               stop_position_producer,
+                                               get_position_producer_stats)
 
 # Global cache for app data (lazy initialization)
 _app_data_cache = None
@@ -45,7 +74,8 @@ def import_app_data(satcat_loc, img_loc, metadata_loc, res):
     @param img_loc: static location of Earth map
     @param metadata_loc: dynamic location of TLE metadata
     @param res: integer - Earth map resolution in increments of 2^x for integer x
-    @return satcat:  dataframe of satellite data
+    @return satcat:  dataframe of satellite data (compact schema - see compact_satcat)
+    @return tle: N x 2 fixed-width bytes array of TLE1 and TLE2 data
     @return img_compr:  compressed image array of Earth map
     @return tbl_col_map: dict of column name mapping for table export
     '''
@@ -56,6 +86,13 @@ def import_app_data(satcat_loc, img_loc, metadata_loc, res):
     # satcat = pd.read_csv('https://raw.githubusercontent.com/pseud-acc/SatTrack/refs/heads/main/dat/clean/satcat_tle.csv')
     print("Satellite catalgoue and TLE data successfully imported!")
 
+    # Compact in-memory schema (held by every worker)
+    satcat, tle, satcat_memory = compact_satcat(satcat)
+    print(f" - Satellite catalogue memory: {satcat_memory['before'].sum()/1e6:.1f}MB -> "
+          f"{satcat_memory['after'].sum()/1e6:.1f}MB")
+    for col, row in satcat_memory[satcat_memory['saved'] != 0].iterrows():
+        print(f"   {col}: {row['before']/1e3:.0f}kB -> {row['after']/1e3:.0f}kB")
+
     # Import TLE download metadata
     metadata = pd.read_csv(metadata_loc)
     tle_metadata = metadata[metadata["Source"]=="Celestrak_TLE"]["Last Update"].values[0]
@@ -70,7 +107,7 @@ def import_app_data(satcat_loc, img_loc, metadata_loc, res):
     # Compress image
     img_compr = img[0:-1:res,0:-1:res]
 
-    return satcat, img_compr, tle_metadata
+    return satcat, tle, img_compr, tle_metadata
 
 def initialise_app_data():
     '''
@@ -79,22 +116,64 @@ def initialise_app_data():
 
     print("Initialising app data...")
     # Import data for visualisations
-    df, img, tle_metadata = import_app_data(satcat_loc, img_loc, metadata_loc, _resolution_3d_earth_map__c)
+    df, tle, img, tle_metadata = import_app_data(satcat_loc, img_loc, metadata_loc, _resolution_3d_earth_map__c)
 
     # Logging - to replace print w/ logging module later
     print(f" - Satellite catalogue size: {df.shape}")
     print(f" - Earth map size (compressed): {img.shape}")
     print(f" - TLE metadata: {tle_metadata}")
 
+    # Parse TLEs once for the whole catalogue
+    satrec_store = create_satrec_store(df["SatCatId"].values, np.char.decode(tle, "ascii"))
+    print(f" - Parsed TLEs: {len(satrec_store['satrec'])}")
+
+    # Process-pool propagation for large catalogues (only when initialised at startup - workers are forked)
+    if propagation_workers > 0 and df.shape[0] >= propagation_parallel_threshold:
+        try:
+            satrec_store['propagation_pool'] = create_propagation_pool(np.char.decode(tle, "ascii"),
+                                                                       propagation_workers)
+            satrec_store['parallel_threshold'] = propagation_parallel_threshold
+            print(f" - Propagation pool started ({propagation_workers} workers)")
+        except RuntimeError as e:
+            print(f" - Propagation pool not started, propagating in a single process: {e}")
+
+    # Compressed ephemeris for orbit paths
+    if ephemeris_enabled:
+        jd, fr = datetime64_to_jday(datetime.utcnow())
+        satrec_store['ephemeris'] = fit_chebyshev_ephemeris(satrec_store, jd, fr, ephemeris_window, ephemeris_segment,
+                                                            ephemeris_degree, ephemeris_tolerance)
+        print(f" - Chebyshev ephemeris fitted ({satrec_store['ephemeris']['valid'].sum()} within tolerance)")
+
+    # Shared full-catalogue position snapshots
+    position_cache = create_position_cache(satrec_store, position_cache_resolution,
+                                           position_cache_max_size, position_cache_ttl)
+
+    # Background full-catalogue propagation (callbacks read latest snapshot) - started by first snapshot request
+    if position_producer_enabled:
+        position_cache['producer'] = create_position_producer(satrec_store, position_producer_cadence,
+                                                              position_cache_resolution, position_producer_idle_timeout)
+        print(f" - Position producer enabled (cadence: {position_producer_cadence}s, "
+              f"idle timeout: {position_producer_idle_timeout}s)")
+
     # Initialise Filters
-    options, initial_filter = create_data_filters(df)
+    options, initial_filter = create_data_filters(df, dropdown_search_limit)
+    filter_index = create_filter_index(df)
+    filter_cache = create_filter_cache(filter_cache_max_size)
+    dropdown_index = create_filter_search_index(create_filter_dropdown_index(filter_index))
+    filter_session_store = create_filter_session_store(filter_session_max_sessions, filter_session_ttl)
+    presets = create_filter_presets(filter_presets, options, df, initial_filter, filter_index, filter_cache)
+    for name, preset in presets.items():
+        print(f" - Filter preset precomputed: {name} ({len(preset['row_index'])} satellites)")
 
     # Initilise Visualisations
     surf_3d = create_3d_surface(img)
     layout_3d = create_3d_layout()
     figure_3d = create_3d_figure(layout_3d, surf_3d)
+    hover_text_index_3d = create_3d_hover_text_index(df)
+    orbit_path_cache = create_orbit_path_cache(orbit_path_cache_max_bytes, orbit_path_cache_ttl)
     layout_2d = create_2d_layout()
     figure_2d = create_2d_figure(layout_2d)
+    ground_track_cache = create_orbit_path_cache(orbit_path_cache_max_bytes, orbit_path_cache_ttl)
 
     # Define table column mapping
     tbl_column_map = create_table_mapping()
@@ -105,6 +184,10 @@ def initialise_app_data():
     # Satellite Visualisation Data
     app_data['data'] = dict()
     app_data['data']['satcat_df'] = df
+    app_data['data']['tle'] = tle
+    tle.setflags(write=False)
+    app_data['data']['satrec_store'] = satrec_store
+    app_data['data']['position_cache'] = position_cache
     app_data['data']['tle_metadata'] = tle_metadata
     app_data['data']['tbl_col_map'] = tbl_column_map
 
@@ -112,15 +195,23 @@ def initialise_app_data():
     app_data['filter'] = dict()
     app_data['filter']['options'] = options
     app_data['filter']['initial_filter'] = initial_filter
+    app_data['filter']['filter_index'] = filter_index
+    app_data['filter']['filter_cache'] = filter_cache
+    app_data['filter']['dropdown_index'] = dropdown_index
+    app_data['filter']['filter_session_store'] = filter_session_store
+    app_data['filter']['presets'] = presets
     # 3D Visualisation
     app_data['viz_3d'] = dict()
     app_data['viz_3d']['surface'] = surf_3d
     app_data['viz_3d']['layout'] = layout_3d
     app_data['viz_3d']['base_figure'] = figure_3d
+    app_data['viz_3d']['hover_text_index'] = hover_text_index_3d
+    app_data['viz_3d']['orbit_path_cache'] = orbit_path_cache
     # 2D Visualisation
     app_data['viz_2d'] = dict()
     app_data['viz_2d']['layout'] = layout_2d
     app_data['viz_2d']['base_figure'] = figure_2d
+    app_data['viz_2d']['ground_track_cache'] = ground_track_cache
 
     return app_data
 
@@ -131,7 +222,39 @@ def get_app_data():
         _app_data_cache = initialise_app_data()
     return _app_data_cache
 
+def get_position_producer_status():
+    """Monitoring statistics of background position producer (None if disabled)"""
+    producer = get_app_data()['data']['position_cache'].get('producer')
+    if producer is None:
+        return None
+    return get_position_producer_stats(producer)
+
+def get_filter_cache_status():
+    """Monitoring statistics of filter result cache (hits, misses, hit rate, size)"""
+    return get_filter_cache_stats(get_app_data()['filter']['filter_cache'])
+
+def get_filter_session_status():
+    """Monitoring statistics of per-session filter masks (sessions, masks recomputed/reused)"""
+    return get_filter_session_stats(get_app_data()['filter']['filter_session_store'])
+
+def get_orbit_path_cache_status():
+    """Monitoring statistics of orbit path cache (hits, misses, hit rate, size, memory)"""
+    return get_orbit_path_cache_stats(get_app_data()['viz_3d']['orbit_path_cache'])
+
+def get_ground_track_cache_status():
+    """Monitoring statistics of 2D ground track cache (hits, misses, hit rate, size, memory)"""
+    return get_orbit_path_cache_stats(get_app_data()['viz_2d']['ground_track_cache'])
+
 def clear_app_data_cache():
     """Force reinitialization (useful for testing or data reload)"""
     global _app_data_cache
+    if _app_data_cache is not None:
+        clear_filter_cache(_app_data_cache['filter']['filter_cache'])
+        clear_filter_sessions(_app_data_cache['filter']['filter_session_store'])
+        clear_orbit_path_cache(_app_data_cache['viz_3d']['orbit_path_cache'])
+        clear_orbit_path_cache(_app_data_cache['viz_2d']['ground_track_cache'])
+        if 'producer' in _app_data_cache['data']['position_cache']:
+            stop_position_producer(_app_data_cache['data']['position_cache']['producer'])
+        if 'propagation_pool' in _app_data_cache['data']['satrec_store']:
+            close_propagation_pool(_app_data_cache['data']['satrec_store']['propagation_pool'])
     _app_data_cache = None
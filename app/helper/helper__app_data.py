@@ -4,12 +4,20 @@ This module defines functions to assist with generating app data
 
 Example:
 
-        $ python helper__app_data.py
+        $ python -m app.helper.helper__app_data
 
 Function:
+    compact_satcat: Convert satellite catalogue to compact typed schema
     create_data_filters: Initialise filter and table columns
-    filter_satellite_data: Filter dataframe based on user inputs
+    create_filter_signature: Create canonical signature of user filter inputs
+    create_filter_update: Create updated filter dictionary from user inputs
+    select_satellite_rows: Select rows of satellite catalogue matching user inputs
+    create_filter_breakdown: Count satellites matching user inputs, per value of a catalogue column
+    compute_satellite_positions: Compute satellite positions at current time for selected rows
+    filter_satellite_data: Filter satellite catalogue based on user inputs
+    get_satellite_columns: Get catalogue columns of filtered satellites
     generate_orbital_path: Calculate orbital path for satellite
+    stress_test_filter_threads: Run filtering and table formatting from many threads against shared app data
 Todo:
     *
 
@@ -19,17 +27,62 @@ Todo:
 # Standard libraries
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 # Internal modules
-from app.helper.helper__satellite_position import (compute_satloc, lla_to_xyz)
-from app.helper.helper__constants import _radius_earth__c
+from sgp4.api import Satrec
 
-def create_data_filters(df):
+from app.helper.helper__satellite_position import (compute_satloc, compute_satloc_path, teme_to_scene,
+                                                   get_satrec_store_index, select_satrec_array,
+                                                   datetime64_to_jday, compute_gmst)
+from app.helper.helper__position_cache import get_position_snapshot, select_position_columns
+from app.helper.helper__ephemeris import get_ephemeris_positions
+from app.helper.helper__filter_index import (create_filter_index, select_filter_rows, count_filter_rows,
+                                             get_filter_cache_rows, put_filter_cache_rows)
+from app.helper.helper__filter_session import select_filter_rows_session
+from app.helper.helper__constants import (_radius_earth__c, _position_columns__c, _filter_signature_columns__c,
+                                          _categorical_columns__c, _int32_columns__c)
+
+def compact_satcat(df_in, categorical_columns=_categorical_columns__c, int32_columns=_int32_columns__c):
+    ''' 
+    Convert satellite catalogue to compact typed schema - categoricals for low-cardinality text columns, int32 for
+    integer columns and TLEs moved out of the dataframe into a fixed-width bytes array.
+
+    @param df_in: (DataFrame) satellite catalogue dataframe (as read from csv)
+    @param categorical_columns: (tuple) columns to convert to categoricals
+    @param int32_columns: (tuple) columns to convert to int32
+    @return df_out: (DataFrame) compact satellite catalogue dataframe (without TLE1 and TLE2 columns)
+    @return tle: (array) N x 2 fixed-width bytes array of TLE1 and TLE2 data
+    @return memory_report: (DataFrame) memory per column before and after conversion (bytes) and memory saved
+    '''
+    memory_before = df_in.memory_usage(index=False, deep=True)
+
+    # Fixed-width TLE bytes
+    tle = np.stack([df_in[col].values.astype(str).astype(np.bytes_) for col in ["TLE1","TLE2"]], axis=1)
+
+    # Compact column types
+    df_out = df_in.drop(columns=["TLE1","TLE2"])
+    df_out = df_out.astype({**{col: "category" for col in categorical_columns if col in df_out.columns},
+                            **{col: np.int32 for col in int32_columns if col in df_out.columns}})
+
+    memory_after = df_out.memory_usage(index=False, deep=True)
+    memory_after["TLE1"] = memory_after["TLE2"] = tle.nbytes // 2
+
+    memory_report = pd.DataFrame(dict(before=memory_before, after=memory_after[memory_before.index]))
+    memory_report["saved"] = memory_report["before"] - memory_report["after"]
+
+    return df_out, tle, memory_report
+
+def create_data_filters(df, search_limit=None):
     ''' 
     Initialise filter and table columns.
 
     @param df: (array) satellite catalogue array
+    @param search_limit: (int) number of satellite name and SATCAT number options sent with page - further options
+        are served by dropdown search (optional - None sends all options)
     @return options:  dict of filter options for dropdown and checkbox
     @return init_filter: dict of initial filter values
     @return tbl_col_map: dict of column name mapping for table export
@@ -46,9 +99,9 @@ def create_data_filters(df):
 
     options["purpose"] = sorted(list(set(sum([a.split("/") for a in df.Purpose.unique()], []))))
 
-    options["satname"] = list(np.sort(df.ObjectName.unique()))
+    options["satname"] = list(np.sort(df.ObjectName.unique()))[:search_limit]
 
-    options["satcatid"] = list(np.sort(df.SatCatId.unique()).astype(str))
+    options["satcatid"] = list(np.sort(df.SatCatId.unique()).astype(str))[:search_limit]
     
     options["launchyear"] = [df.LaunchYear.min(),df.LaunchYear.max()]
 
@@ -64,13 +117,31 @@ def create_data_filters(df):
     
     return options, init_filter
 
-def filter_satellite_data(df_in, input_filter,
+def create_filter_signature(status, orbit, satname, satcatid, owner, launchvehicle, purpose, year):
+    '''
+    Create canonical signature of user filter inputs - order-insensitive and hashable (filter cache key).
+
+    @param status: (list) List of status filters
+    @param orbit: (list) List of orbit class filters
+    @param satname: (str) Satellite name filter
+    @param satcatid: (str) Satellite catalog ID filter
+    @param owner: (list) List of owner filters
+    @param launchvehicle: (list) List of launch vehicle class filters
+    @param purpose: (list) List of purpose filters
+    @param year: (list) Year range [min, max]
+    @return: (tuple) filter signature
+    '''
+    return (tuple(sorted(set(status))), tuple(sorted(set(orbit))),
+            satname, None if satcatid is None else int(satcatid),
+            tuple(sorted(set(owner))), tuple(sorted(set(launchvehicle))), tuple(sorted(set(purpose))),
+            (int(year[0]), int(year[1])))
+
+def create_filter_update(input_filter,
              status, orbit, satname, satcatid, owner, launchvehicle, purpose, year):
-    ''' 
-    Filter dataframe based on user inputs (pure function).
+    '''
+    Create updated filter dictionary from user inputs.
 
-    @param df_in: (DataFrame) Input satellite catalogue dataframe
-    @param input_filter: (dict) Current filter dictionary
+    @param input_filter: (dict) Initial filter dictionary
     @param status: (list) List of status filters
     @param orbit: (list) List of orbit class filters
     @param satname: (str) Satellite name filter
@@ -79,9 +150,8 @@ def filter_satellite_data(df_in, input_filter,
     @param launchvehicle: (list) List of launch vehicle class filters
     @param purpose: (list) List of purpose filters
     @param year: (list) Year range [min, max]
-    @return: (DataFrame) Filtered dataframe
-    '''     
-    # Create updated filter dictionary
+    @return: (dict) Updated filter dictionary - filter values per column
+    '''
     input_filter_update = input_filter.copy()
     input_filter_update["Status"] =  status      
     input_filter_update["OrbitClass"] = orbit
@@ -97,30 +167,197 @@ def filter_satellite_data(df_in, input_filter,
         input_filter_update["Purpose"] = purpose
     input_filter_update["LaunchYear"] = list(range(year[0],year[1]+1))     
 
-    # If filter has been updated, filter and return new dataframe
-    for col,vals in input_filter_update.items():
-        if col == "Purpose":
-            indx = df_in.Purpose.str.split("/").apply(lambda x: True if len(set(x).intersection(set(vals))) > 0 else False)     
-            if len(indx) > 0: df_in = df_in[indx]
-        else:
-            df_in = df_in[df_in[col].isin(vals)]    
-                
-    # Compute satellite locations at current time
+    return input_filter_update
+
+def select_satellite_rows(df_in, input_filter,
+             status, orbit, satname, satcatid, owner, launchvehicle, purpose, year,
+             filter_index=None, filter_cache=None, filter_session_store=None, session_id=None):
+    '''
+    Select rows of satellite catalogue matching user inputs (pure function - no propagation).
+
+    @param df_in: (DataFrame) Input satellite catalogue dataframe
+    @param input_filter: (dict) Current filter dictionary
+    @param status: (list) List of status filters
+    @param orbit: (list) List of orbit class filters
+    @param satname: (str) Satellite name filter
+    @param satcatid: (str) Satellite catalog ID filter
+    @param owner: (list) List of owner filters
+    @param launchvehicle: (list) List of launch vehicle class filters
+    @param purpose: (list) List of purpose filters
+    @param year: (list) Year range [min, max]
+    @param filter_index: (dict) Filter index of df_in created by create_filter_index (optional - built on the fly if
+        not given)
+    @param filter_cache: (dict) Filter result cache created by create_filter_cache (optional) - selections are
+        memoised by canonical filter signature
+    @param filter_session_store: (dict) Filter session store created by create_filter_session_store (optional)
+    @param session_id: (str) Session id (optional) - if given with filter_session_store, the session's per-dimension
+        row masks are reused and only dimensions changed since its last query are recomputed
+    @return: (array) Ascending row positions of matching satellites (read-only)
+    '''
+    signature = create_filter_signature(status, orbit, satname, satcatid, owner, launchvehicle, purpose, year)
+    if filter_cache is not None:
+        row_index = get_filter_cache_rows(filter_cache, signature)
+        if row_index is not None:
+            return row_index
+
+    # Select filtered rows from filter index (no intermediate dataframe copies)
+    if filter_index is None:
+        filter_index = create_filter_index(df_in)
+    input_filter_update = create_filter_update(input_filter, status, orbit, satname, satcatid,
+                                               owner, launchvehicle, purpose, year)
+    if filter_session_store is not None and session_id is not None:
+        # Only re-evaluate filter dimensions changed since the session's last query
+        row_index = select_filter_rows_session(filter_session_store, session_id, filter_index, input_filter_update,
+                                               dict(zip(_filter_signature_columns__c, signature)))
+    else:
+        row_index = select_filter_rows(filter_index, input_filter_update)
+    row_index.setflags(write=False)
+
+    if filter_cache is not None:
+        put_filter_cache_rows(filter_cache, signature, row_index)
+
+    return row_index
+
+def create_filter_breakdown(df_in, input_filter,
+             status, orbit, satname, satcatid, owner, launchvehicle, purpose, year,
+             by, filter_index=None):
+    '''
+    Count satellites matching user inputs, per value of a catalogue column (summed from the filter index count cube -
+    no row scan for sidebar filters).
+
+    @param df_in: (DataFrame) Input satellite catalogue dataframe
+    @param input_filter: (dict) Current filter dictionary
+    @param status: (list) List of status filters
+    @param orbit: (list) List of orbit class filters
+    @param satname: (str) Satellite name filter
+    @param satcatid: (str) Satellite catalog ID filter
+    @param owner: (list) List of owner filters
+    @param launchvehicle: (list) List of launch vehicle class filters
+    @param purpose: (list) List of purpose filters
+    @param year: (list) Year range [min, max]
+    @param by: (str) Catalogue column to break counts down by - a filter column, e.g. Status, OrbitClass, Owner,
+        LaunchYear or Purpose (satellites with several purposes are counted once per purpose)
+    @param filter_index: (dict) Filter index of df_in created by create_filter_index (optional - built on the fly if
+        not given)
+    @return: (DataFrame) Breakdown table - column values with at least one satellite and their count ("Count"), by
+        descending count (ascending year for LaunchYear)
+    '''
+    if filter_index is None:
+        filter_index = create_filter_index(df_in)
+    input_filter_update = create_filter_update(input_filter, status, orbit, satname, satcatid,
+                                               owner, launchvehicle, purpose, year)
+
+    counts = count_filter_rows(filter_index, input_filter_update, by)
+    values = filter_index['purpose']['values'] if by == "Purpose" else filter_index['dimensions'][by]['values']
+
+    breakdown = pd.DataFrame({by: values, "Count": counts})
+    breakdown = breakdown[breakdown["Count"] > 0]
+    if by == "LaunchYear":
+        breakdown = breakdown.sort_values(by=[by])
+    else:
+        breakdown = breakdown.sort_values(by=["Count", by], ascending=[False, True], kind="stable")
+
+    return breakdown.reset_index(drop=True)
+
+def compute_satellite_positions(df_in, row_index, satrec_store=None, position_cache=None):
+    '''
+    Compute satellite positions at current time for selected rows of satellite catalogue.
+
+    @param df_in: (DataFrame) Input satellite catalogue dataframe
+    @param row_index: (array) Row positions of selected satellites
+    @param satrec_store: (dict) Parsed satellite store (optional) - if given, TLEs are not re-parsed
+    @param position_cache: (dict) Position snapshot cache (optional) - if given, positions are read from the shared
+        full-catalogue snapshot at the quantised current time instead of being propagated
+    @return: (datetime) UTC datetime of satellite positions
+    @return: (dict) Columnar float32 satellite positions (see select_position_columns) - satellites with failed
+        propagation are dropped from the position store and its row index
+    '''
+    satcat_id = df_in["SatCatId"].values[row_index]
     time_now = datetime.utcnow()
 
-    df_in[["x","y","z","lat","lon","alt"]] = compute_satloc(df_in[["TLE1","TLE2"]].values, time_now, _radius_earth__c, False)
-    
-    df_in = df_in.dropna()
-    
-    df_in["xp"], df_in["yp"], df_in["zp"] = lla_to_xyz(df_in.lat,df_in.lon,df_in.alt,_radius_earth__c)
+    if position_cache is not None:
+        # Selected satellites gathered from snapshot (copied under producer lock)
+        time_now, positions = get_position_snapshot(position_cache, time_now,
+                                                    get_satrec_store_index(position_cache['satrec_store'], satcat_id))
+        sat_index = None
+    else:
+        if satrec_store is not None:
+            sat_in = select_satrec_array(satrec_store, satcat_id)
+        else:
+            sat_in = df_in[["TLE1","TLE2"]].values[row_index]
+
+        sat_loc = compute_satloc(sat_in, time_now, _radius_earth__c, False)
+        positions = np.empty((9, len(row_index)), dtype=np.float32)
+        positions[:6] = sat_loc.T
+        teme_to_scene(sat_loc[:, :3], compute_gmst(*datetime64_to_jday(time_now)), out=positions[6:9].T)
+        sat_index = np.arange(len(row_index))
+
+    return time_now, select_position_columns(positions, sat_index, row_index)
+
+def filter_satellite_data(df_in, input_filter,
+             status, orbit, satname, satcatid, owner, launchvehicle, purpose, year,
+             satrec_store=None, position_cache=None, filter_index=None, filter_cache=None,
+             filter_session_store=None, session_id=None):
+    ''' 
+    Filter dataframe based on user inputs (pure function).
+
+    @param df_in: (DataFrame) Input satellite catalogue dataframe
+    @param input_filter: (dict) Current filter dictionary
+    @param status: (list) List of status filters
+    @param orbit: (list) List of orbit class filters
+    @param satname: (str) Satellite name filter
+    @param satcatid: (str) Satellite catalog ID filter
+    @param owner: (list) List of owner filters
+    @param launchvehicle: (list) List of launch vehicle class filters
+    @param purpose: (list) List of purpose filters
+    @param year: (list) Year range [min, max]
+    @param satrec_store: (dict) Parsed satellite store (optional) - if given, TLEs are not re-parsed
+    @param position_cache: (dict) Position snapshot cache (optional) - if given, positions are read from the shared
+        full-catalogue snapshot at the quantised current time instead of being propagated
+    @param filter_index: (dict) Filter index of df_in created by create_filter_index (optional - built on the fly if
+        not given)
+    @param filter_cache: (dict) Filter result cache created by create_filter_cache (optional)
+    @param filter_session_store: (dict) Filter session store created by create_filter_session_store (optional)
+    @param session_id: (str) Session id (optional)
+    @return: (dict) Filter result - row positions of filtered satellites in df_in ('index'), UTC datetime of
+        positions ('time'), columnar float32 positions aligned to 'index' ('positions', see select_position_columns)
+        and encoded satellite status ('status_encoded', 1 - active, 0 - inactive). Arrays are read-only; df_in is
+        never copied or modified (see get_satellite_columns)
+    '''     
+    # Select rows matching filter
+    row_index = select_satellite_rows(df_in, input_filter,
+                                      status, orbit, satname, satcatid, owner, launchvehicle, purpose, year,
+                                      filter_index, filter_cache, filter_session_store, session_id)
+
+    # Compute satellite locations at current time
+    time_now, sat_positions = compute_satellite_positions(df_in, row_index, satrec_store, position_cache)
 
     # Generate encoded satelite status for plotting
-    sat_status_encoded = np.where(df_in["Status"] == "Active", 1, 0)
-    
-    return df_in, time_now, sat_status_encoded
+    sat_status_encoded = (get_satellite_columns(df_in, sat_positions, ["Status"])["Status"] == "Active").astype(int)
+
+    sat_result = dict(index=sat_positions['index'], time=time_now, positions=sat_positions,
+                      status_encoded=sat_status_encoded)
+    for arr in [sat_positions['index'], sat_positions['columns'], sat_status_encoded] + \
+               [sat_positions[col] for col in _position_columns__c]:
+        arr.setflags(write=False)
+
+    return sat_result
+
+def get_satellite_columns(df_in, sat_result, columns):
+    '''
+    Get catalogue columns of filtered satellites - only the requested columns are gathered, the shared catalogue
+    dataframe is not copied.
+
+    @param df_in: (DataFrame) Input satellite catalogue dataframe
+    @param sat_result: (dict) Filter result created by filter_satellite_data (or position store - anything with an
+        'index' of row positions)
+    @param columns: (list) Catalogue columns to get
+    @return: (dict) Column values (array) per column, aligned to sat_result['index']
+    '''
+    return {col: np.asarray(df_in[col].values.take(sat_result['index'])) for col in columns}
 
 
-def generate_orbital_path(df_in, res, time_now, eci):
+def generate_orbital_path(df_in, res, time_now, eci, satrec_store=None):
     ''' 
     Calculate orbital path for satellite (pure function).
 
@@ -128,20 +365,123 @@ def generate_orbital_path(df_in, res, time_now, eci):
     @param res: (int) Number of time steps to calculate (resolution)
     @param time_now: (datetime) Current timestamp
     @param eci: (bool) Whether to calculate ECI (3D) or geodetic (2D) coordinates
+    @param satrec_store: (dict) Parsed satellite store (optional) - if given, TLE is not re-parsed and positions are
+        read from the store's Chebyshev ephemeris (satrec_store['ephemeris']) when one has been fitted
     @return: (DataFrame) Dataframe with orbital path coordinates
     '''      
-    # Calculate delta times for orbit path
+    # Calculate delta times for orbit path (whole seconds from start of current second)
     orbit_dt = np.linspace(0,1.*float(df_in["OrbitalPeriod"].values[0]), res)
+    orbit_dt_s = np.floor(time_now.microsecond * 1e-6 + orbit_dt * 60.)
 
     # Generate time lapse array
-    time_lapse=[]
-    for dt in orbit_dt:
-        time_lapse = np.append(time_lapse,(time_now + timedelta(minutes=dt)).replace(microsecond=0))
-    df_path = pd.DataFrame(compute_satloc(df_in[["TLE1","TLE2"]].astype(str).values[0], time_lapse, _radius_earth__c, eci), 
-                       columns =["x","y","z","lat","lon","alt"])
-    df_path["xp"], df_path["yp"], df_path["zp"] = lla_to_xyz(df_path.lat,df_path.lon,df_path.alt,_radius_earth__c)    
-    for col in np.setdiff1d(list(df_in.columns),list(df_path.columns)):
-        df_path[col] = df_in[col].values[0]
+    time_lapse = np.datetime64(time_now.replace(microsecond=0), "s") + orbit_dt_s.astype("timedelta64[s]")
+
+    # Julian dates of time lapse
+    jd, fr = datetime64_to_jday(time_lapse)
+
+    # Get parsed satellite object - positions served from Chebyshev ephemeris if available
+    teme_p = None
+    if satrec_store is not None:
+        sat_pos = get_satrec_store_index(satrec_store, df_in["SatCatId"].values[:1])
+        satrec = satrec_store['satrec'][sat_pos[0]]
+        if satrec_store.get('ephemeris') is not None:
+            teme_p = get_ephemeris_positions(satrec_store['ephemeris'], jd, fr, sat_pos)[0]
+    else:
+        tle = df_in[["TLE1","TLE2"]].astype(str).values[0]
+        satrec = Satrec.twoline2rv(tle[0], tle[1])
+
+    sat_path = compute_satloc_path(satrec, jd, fr, _radius_earth__c, eci, teme_p)
+
+    # Scene coordinates - GMST fixed at first epoch for ECI paths
+    gmst = compute_gmst(jd[0], fr[0]) if eci else compute_gmst(jd, fr)
+    df_path = pd.DataFrame(np.concatenate((sat_path, teme_to_scene(sat_path[:, :3], gmst)), axis=1),
+                           columns=list(_position_columns__c))
+    df_path = df_path.assign(**{col: df_in[col].values[0]
+                                for col in np.setdiff1d(list(df_in.columns),list(df_path.columns))})
     df_path["Datetime"] = time_lapse
 
-    return df_path
\ No newline at end of file
+    return df_path
+
+def stress_test_filter_threads(app_data, n_threads=16, n_requests=800, n_sessions=7, seed=0):
+    '''
+    Run filtering and table formatting from many threads against shared app data - one filter cache, filter session
+    store and position snapshot cache. Each request's row set is checked against serial filtering (without caches or
+    sessions) and the shared catalogue dataframe and TLE array are checked to be unchanged afterwards.
+
+    @param app_data: (dict) app data created by initialise_app_data
+    @param n_threads: (int) number of threads
+    @param n_requests: (int) number of requests (filter inputs cycle through a fixed set of random filters)
+    @param n_sessions: (int) number of sessions requests are spread over (concurrent requests share sessions)
+    @param seed: (int) random seed of filter inputs
+    @return: (dict) number of requests and elapsed time (s)
+    '''
+    from app.helper.helper__table_display import format_table_data
+
+    df = app_data['data']['satcat_df']
+    tle = app_data['data']['tle']
+    input_filter = app_data['filter']['initial_filter']
+    options = app_data['filter']['options']
+    position_cache = app_data['data']['position_cache']
+    filter_index = app_data['filter']['filter_index']
+    filter_cache = app_data['filter']['filter_cache']
+    filter_session_store = app_data['filter']['filter_session_store']
+
+    # Random filter inputs
+    rng = random.Random(seed)
+    satcat_ids = [str(a) for a in df["SatCatId"].values[::max(1, df.shape[0] // 20)]]
+    year_min, year_max = int(options["launchyear"][0]), int(options["launchyear"][1])
+    filters = []
+    for _ in range(60):
+        filters.append(dict(status=rng.sample(["Active", "Inactive"], rng.randint(1, 2)),
+                            orbit=rng.sample(options["orbit"], rng.randint(1, len(options["orbit"]))),
+                            satname=None, satcatid=rng.choice(satcat_ids) if rng.random() < 0.1 else None,
+                            owner=rng.sample(options["owner"], rng.randint(0, 3)),
+                            launchvehicle=rng.sample(options["launchvehicle"], rng.randint(0, 1)),
+                            purpose=rng.sample(options["purpose"], rng.randint(0, 2)),
+                            year=sorted(rng.randint(year_min, year_max) for _ in range(2))))
+
+    # Serial results
+    df_hash = pd.util.hash_pandas_object(df).sum()
+    tle_copy = tle.copy()
+    expected_rows = [select_satellite_rows(df, input_filter, **f) for f in filters]
+    expected_ids = [get_satellite_columns(df, filter_satellite_data(df, input_filter, **f,
+                                                                    position_cache=position_cache),
+                                          ["SatCatId"])["SatCatId"] for f in filters]
+
+    def run_request(i):
+        f = filters[i % len(filters)]
+        session_id = f"stress-test-{i % n_sessions}"
+
+        row_index = select_satellite_rows(df, input_filter, **f, filter_index=filter_index, filter_cache=filter_cache,
+                                          filter_session_store=filter_session_store, session_id=session_id)
+        assert np.array_equal(row_index, expected_rows[i % len(filters)]), f"Row set mismatch (request {i})"
+
+        sat_result = filter_satellite_data(df, input_filter, **f, position_cache=position_cache,
+                                           filter_index=filter_index, filter_cache=filter_cache,
+                                           filter_session_store=filter_session_store, session_id=session_id)
+        sat_ids = get_satellite_columns(df, sat_result, ["SatCatId"])["SatCatId"]
+        assert np.array_equal(sat_ids, expected_ids[i % len(filters)]), f"Filter result mismatch (request {i})"
+
+        tbl = format_table_data(df, sat_result)
+        assert sorted(row["SATCAT Number"] for row in tbl) == sorted(sat_ids), f"Table mismatch (request {i})"
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(n_threads) as executor:
+        list(executor.map(run_request, range(n_requests)))
+    elapsed = time.perf_counter() - t_start
+
+    # Shared data unchanged
+    assert pd.util.hash_pandas_object(df).sum() == df_hash, "Shared catalogue dataframe was modified"
+    assert np.array_equal(tle, tle_copy), "Shared TLE array was modified"
+
+    return dict(requests=n_requests, elapsed_s=elapsed)
+
+
+if __name__ == "__main__":
+    from app.core.state import (get_app_data, clear_app_data_cache, get_filter_cache_status,
+                                get_filter_session_status)
+
+    print("Concurrent filtering:", stress_test_filter_threads(get_app_data()))
+    print("Filter cache:", get_filter_cache_status())
+    print("Filter sessions:", get_filter_session_status())
+    clear_app_data_cache()
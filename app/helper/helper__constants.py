@@ -20,4 +20,25 @@ _radius_earth__c = 6378.137
 # 3D Visualisation Constants
 _len_3d_viz_axis__c = 250000 # axis length (from earth surface to axis limit) in km
 
-_resolution_3d_earth_map__c = 8 # resolution of earth map in increments of 2^x for integer x
\ No newline at end of file
+# 2D Visualisation Constants
+_ground_track_extension__c = 0.1 # fraction of orbital period the client's ground track is extended by (beyond one period ahead)
+_ground_track_max_drop__c = 0.1 # fraction of orbital period of past samples dropped from the client's ground track before it is re-sent instead
+
+_resolution_3d_earth_map__c = 8 # resolution of earth map in increments of 2^x for integer x
+
+# Satellite Position Constants
+_position_columns__c = ("x", "y", "z", "lat", "lon", "alt", "xp", "yp", "zp") # ECI x/y/z, geodetic lat/lon/alt, 3D scene x/y/z
+
+# Satellite Filter Constants
+_filter_dimensions__c = ("SatCatId", "ObjectName", "LaunchSiteCountry", "Owner", "UseType", "LaunchVehicleClass",
+                         "OrbitClass", "LaunchYear", "Status") # indexed filter columns (Purpose indexed separately)
+_filter_index_sparse_fraction__c = 1/16 # read rows from inverted lists if first filter selects less than this fraction
+_filter_signature_columns__c = ("Status", "OrbitClass", "ObjectName", "SatCatId", "Owner", "LaunchVehicleClass",
+                                "Purpose", "LaunchYear") # filter column of each user input in filter signature
+_count_cube_dimensions__c = ("Status", "OrbitClass", "Owner", "LaunchVehicleClass", "LaunchYear",
+                             "Purpose") # filter columns of precomputed count cube (sidebar filters with few values)
+
+# Satellite Catalogue Schema Constants
+_categorical_columns__c = ("Status", "StatusCode", "OrbitClass", "OrbitClassEstimated", "LaunchSiteCountry", "Owner",
+                           "UseType", "LaunchVehicleClass", "Purpose") # low-cardinality text columns
+_int32_columns__c = ("SatCatId", "LaunchYear", "UcsData") # integer columns
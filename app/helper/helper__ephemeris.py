@@ -0,0 +1,238 @@
+"""
+
+This module defines a compressed Chebyshev ephemeris of satellite positions. For each satellite, TEME positions are
+sampled with SGP4 (see compute_satloc_grid) over a rolling window and fitted with piecewise Chebyshev polynomials.
+Positions at arbitrary times within the window are then served by polynomial evaluation instead of running SGP4.
+
+Each fit is checked against direct SGP4 between the interpolation nodes - satellites whose error exceeds the
+tolerance (e.g. highly eccentric orbits near perigee, decayed orbits) are flagged and fall back to SGP4.
+
+Example:
+
+        $ python helper__ephemeris.py
+
+Function:
+    chebyshev_nodes: Chebyshev nodes of the first kind on [-1, 1]
+    chebyshev_basis: Evaluate Chebyshev polynomials at normalised times
+    fit_chebyshev_ephemeris: Fit piecewise Chebyshev ephemeris over a rolling window
+    slide_chebyshev_ephemeris: Slide ephemeris window forward, fitting only new segments
+    evaluate_chebyshev_ephemeris: Evaluate ephemeris positions at arbitrary epochs
+    get_ephemeris_positions: Get TEME positions from ephemeris, sliding window and falling back to SGP4 where needed
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import numpy as np
+import threading
+from sgp4.api import SatrecArray
+
+# Internal modules
+from app.helper.helper__satellite_position import compute_satloc_grid
+from app.helper.helper__constants import _radius_earth__c
+
+def chebyshev_nodes(n_nodes):
+    '''
+    Chebyshev nodes of the first kind on [-1, 1].
+
+    @param n_nodes: (int) number of nodes (polynomial degree + 1)
+    @return: (array) n_nodes x 1 floating point array of nodes
+    '''
+    return np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)
+
+def chebyshev_basis(tau, n_coef):
+    '''
+    Evaluate Chebyshev polynomials T_0 ... T_(n_coef-1) at normalised times.
+
+    @param tau: (array) M x 1 floating point array of normalised times in [-1, 1]
+    @param n_coef: (int) number of coefficients (polynomial degree + 1)
+    @return: (array) M x n_coef floating point array
+    '''
+    tau = np.asarray(tau, dtype=np.float64)
+    basis = np.empty(tau.shape + (n_coef,))
+    basis[..., 0] = 1.
+    if n_coef > 1:
+        basis[..., 1] = tau
+    for k in range(2, n_coef):
+        basis[..., k] = 2. * tau * basis[..., k - 1] - basis[..., k - 2]
+    return basis
+
+def _fit_segments(satrec_array, jd0, t_start, segment, degree, re):
+    '''
+    Fit Chebyshev coefficients and accuracy for consecutive segments.
+
+    @param satrec_array: (SatrecArray) sgp4 satellite array
+    @param jd0: (float) reference Julian date (whole part)
+    @param t_start: (array) S x 1 floating point array of segment start times (days since jd0)
+    @param segment: (float) segment length in days
+    @param degree: (int) polynomial degree
+    @param re: (float) Earth radius
+    @return coef: N x S x 3 x (degree + 1) float32 array of Chebyshev coefficients
+    @return max_error: N x 1 floating point array of maximum position error against SGP4 (km)
+    '''
+    n_coef = degree + 1
+    nodes = chebyshev_nodes(n_coef)
+    # Check points - midway between interpolation nodes
+    checks = 0.5 * (nodes[:-1] + nodes[1:])
+
+    # Sample SGP4 at nodes and check points for every segment in one call
+    tau = np.concatenate((nodes, checks))
+    t_sample = (t_start[:, np.newaxis] + 0.5 * segment * (tau[np.newaxis, :] + 1.)).ravel()
+    r = compute_satloc_grid(satrec_array, np.full(t_sample.shape, jd0), t_sample, re)[0]
+    r = r.reshape(r.shape[0], len(t_start), len(tau), 3)
+
+    # Chebyshev interpolation at nodes
+    basis_nodes = chebyshev_basis(nodes, n_coef)
+    coef = (2. / n_coef) * np.einsum('nsjd,jk->nsdk', r[:, :, :n_coef], basis_nodes)
+    coef[..., 0] *= 0.5
+    coef = np.ascontiguousarray(coef, dtype=np.float32)
+
+    # Accuracy against direct SGP4 at check points (NaN if propagation failed)
+    r_fit = np.einsum('nsdk,jk->nsjd', coef.astype(np.float64), chebyshev_basis(checks, n_coef))
+    err = np.linalg.norm(r_fit - r[:, :, n_coef:], axis=-1)
+    max_error = np.max(err.reshape(err.shape[0], -1), axis=1) if err.size else np.full(r.shape[0], np.nan)
+
+    return coef, max_error
+
+def fit_chebyshev_ephemeris(satrec_store, jd, fr, window, segment, degree, tolerance, re=_radius_earth__c):
+    '''
+    Fit piecewise Chebyshev ephemeris for every satellite in store over a rolling window starting at jd + fr.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param jd: (float) window start Julian date (whole part)
+    @param fr: (float) window start Julian date (fractional part)
+    @param window: (float) window length in hours
+    @param segment: (float) segment length in minutes
+    @param degree: (int) polynomial degree of each segment
+    @param tolerance: (float) maximum permitted position error against SGP4 (km)
+    @param re: (float) Earth radius
+    @return: (dict) Chebyshev ephemeris
+    '''
+    segment_days = segment / 1440.
+    n_seg = int(np.ceil(window * 60. / segment))
+
+    # Whole day reference keeps time offsets small for float64 precision
+    jd0 = float(np.floor(jd + fr - 0.5) + 0.5)
+    t0 = (jd - jd0) + fr
+
+    coef, max_error = _fit_segments(satrec_store['satrec_array'], jd0, t0 + segment_days * np.arange(n_seg),
+                                    segment_days, degree, re)
+
+    ephemeris = dict()
+    ephemeris['satrec_store'] = satrec_store
+    ephemeris['jd0'] = jd0
+    ephemeris['t0'] = t0
+    ephemeris['segment'] = segment_days
+    ephemeris['degree'] = degree
+    ephemeris['tolerance'] = tolerance
+    ephemeris['re'] = re
+    ephemeris['coef'] = coef
+    ephemeris['segment_error'] = np.repeat(max_error[:, np.newaxis], n_seg, axis=1)
+    ephemeris['lock'] = threading.Lock()
+    _update_ephemeris_accuracy(ephemeris)
+
+    return ephemeris
+
+def _update_ephemeris_accuracy(ephemeris):
+    '''
+    Update per-satellite maximum error and validity flags from segment errors.
+
+    @param ephemeris: (dict) Chebyshev ephemeris
+    '''
+    with np.errstate(invalid='ignore'):
+        ephemeris['max_error'] = np.max(ephemeris['segment_error'], axis=1)
+        ephemeris['valid'] = ephemeris['max_error'] <= ephemeris['tolerance']
+
+def slide_chebyshev_ephemeris(ephemeris, jd, fr):
+    '''
+    Slide ephemeris window forward so that it starts at the segment containing jd + fr. Only expired segments are
+    dropped and only new segments at the end of the window are fitted - after a gap longer than the window, the whole
+    window is refitted once.
+
+    @param ephemeris: (dict) Chebyshev ephemeris
+    @param jd: (float) Julian date (whole part)
+    @param fr: (float) Julian date (fractional part)
+    @return: (int) number of segments refitted
+    '''
+    t = (jd - ephemeris['jd0']) + fr
+    n_seg = ephemeris['coef'].shape[1]
+    n_shift = int(np.floor((t - ephemeris['t0']) / ephemeris['segment']))
+    if n_shift <= 0:
+        return 0
+
+    # Window starts at segment containing jd + fr
+    t0 = ephemeris['t0'] + n_shift * ephemeris['segment']
+    n_fit = min(n_shift, n_seg)
+
+    # Fit new segments at end of window (whole window if it has expired)
+    t_new = t0 + ephemeris['segment'] * np.arange(n_seg - n_fit, n_seg)
+    coef_new, error_new = _fit_segments(ephemeris['satrec_store']['satrec_array'], ephemeris['jd0'], t_new,
+                                        ephemeris['segment'], ephemeris['degree'], ephemeris['re'])
+
+    ephemeris['coef'] = np.ascontiguousarray(np.concatenate((ephemeris['coef'][:, n_fit:], coef_new), axis=1))
+    ephemeris['segment_error'] = np.concatenate((ephemeris['segment_error'][:, n_fit:],
+                                                 np.repeat(error_new[:, np.newaxis], n_fit, axis=1)), axis=1)
+    ephemeris['t0'] = t0
+    _update_ephemeris_accuracy(ephemeris)
+
+    return n_fit
+
+def evaluate_chebyshev_ephemeris(ephemeris, jd, fr, sat_index=None):
+    '''
+    Evaluate ephemeris TEME positions at arbitrary epochs. Epochs outside the window return NaN.
+
+    @param ephemeris: (dict) Chebyshev ephemeris
+    @param jd: (array) M x 1 floating point array of Julian dates (whole part)
+    @param fr: (array) M x 1 floating point array of Julian dates (fractional part)
+    @param sat_index: (array) N x 1 integer array of satellite store positions (optional - default all)
+    @return: N x M x 3 floating point array - x, y, z position in TEME (km)
+    '''
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    fr = np.atleast_1d(np.asarray(fr, dtype=np.float64))
+    coef = ephemeris['coef'] if sat_index is None else ephemeris['coef'][sat_index]
+    n_seg = coef.shape[1]
+
+    # Segment and normalised time of each epoch
+    t = ((jd - ephemeris['jd0']) + fr - ephemeris['t0']) / ephemeris['segment']
+    seg = np.floor(t).astype(np.int64)
+    inside = (seg >= 0) & (seg < n_seg)
+    seg = np.clip(seg, 0, n_seg - 1)
+    tau = np.clip(2. * (t - seg) - 1., -1., 1.)
+
+    r = np.einsum('nmdk,mk->nmd', coef[:, seg], chebyshev_basis(tau, coef.shape[-1]))
+    r[:, ~inside] = np.nan
+
+    return r
+
+def get_ephemeris_positions(ephemeris, jd, fr, sat_index=None):
+    '''
+    Get TEME positions from ephemeris. The window is slid forward if the first epoch has moved past the first
+    segment; satellites failing the accuracy check, and epochs outside the window, are propagated with SGP4.
+
+    @param ephemeris: (dict) Chebyshev ephemeris
+    @param jd: (array) M x 1 floating point array of Julian dates (whole part)
+    @param fr: (array) M x 1 floating point array of Julian dates (fractional part)
+    @param sat_index: (array) N x 1 integer array of satellite store positions (optional - default all)
+    @return: N x M x 3 floating point array - x, y, z position in TEME (km)
+    '''
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    fr = np.atleast_1d(np.asarray(fr, dtype=np.float64))
+    if sat_index is None:
+        sat_index = np.arange(ephemeris['coef'].shape[0])
+    sat_index = np.atleast_1d(sat_index)
+
+    with ephemeris['lock']:
+        slide_chebyshev_ephemeris(ephemeris, jd[0], fr[0])
+        r = evaluate_chebyshev_ephemeris(ephemeris, jd, fr, sat_index)
+        valid = ephemeris['valid'][sat_index]
+
+    # Fall back to SGP4 for inaccurate fits and epochs outside window
+    fallback_sat = ~valid | np.isnan(r[:, :, 0]).any(axis=1)
+    if fallback_sat.any():
+        satrec_list = ephemeris['satrec_store']['satrec']
+        satrec_array = SatrecArray([satrec_list[i] for i in sat_index[fallback_sat]])
+        r[fallback_sat] = compute_satloc_grid(satrec_array, jd, fr, ephemeris['re'])[0]
+
+    return r
@@ -9,6 +9,9 @@ Example:
         $ python helper__filter_display.py
 
 Function:
+    create_filter_dropdown_index: Presort satellite name and SATCAT number dropdown options
+    create_filter_search_index: Build prefix and trigram search index over dropdown options
+    search_filter_dropdown_options: Format dynamic filter options for dropdown from search index
     year_slider_display_output: Create display output for year slider
 Todo:
     *
@@ -16,17 +19,94 @@ Todo:
 """
 
 import numpy as np
+from functools import reduce
 from dash import html
 
-def sort_filter_dropdown_options(df):
+def create_filter_dropdown_index(filter_index):
     '''
-    Format dynamic filter options for dropdowns.
-    @param df: (DataFrame) Satellite dataframe
-    @return: (dict) Formatted dynamic filter options
+    Presort satellite name and SATCAT number dropdown options once, with the sorted position of each row's value.
+    @param filter_index: (dict) Filter index created by create_filter_index
+    @return: (dict) Dropdown index - per dropdown column, sorted options and option position of each row
     '''
-    # Generate filter options
-    filter_output = list(np.sort(df.ObjectName.unique())), list(
-            np.sort(df.SatCatId.unique()).astype(str))
+    dropdown_index = dict()
+    for col in ["ObjectName", "SatCatId"]:
+        dim = filter_index['dimensions'][col]
+        order = np.argsort(dim['values'], kind='stable')
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+
+        dropdown_index[col] = dict(options=np.asarray(dim['values'][order].astype(str), dtype=object),
+                                   rank=rank[dim['codes']])
+
+    return dropdown_index
+
+def create_filter_search_index(dropdown_index):
+    '''
+    Build search index over dropdown options - lower-case keys sorted for prefix search and trigram inverted lists
+    for substring search.
+    @param dropdown_index: (dict) Dropdown index created by create_filter_dropdown_index (search index is added in place)
+    @return: (dict) Dropdown index with search index per dropdown column
+    '''
+    for col in ["ObjectName", "SatCatId"]:
+        keys = np.char.lower(dropdown_index[col]['options'].astype(str))
+        prefix_order = np.argsort(keys, kind='stable')
+
+        trigrams = dict()
+        for i, key in enumerate(keys.tolist()):
+            for trigram in set(key[j:j + 3] for j in range(len(key) - 2)):
+                trigrams.setdefault(trigram, []).append(i)
+
+        dropdown_index[col]['search'] = dict(keys=keys, prefix_keys=keys[prefix_order], prefix_order=prefix_order,
+                                             trigrams={k: np.array(v, dtype=np.int32) for k, v in trigrams.items()})
+
+    return dropdown_index
+
+def _search_option_positions(search, query):
+    '''
+    Find options matching search query - prefix matches first, then substring (trigram) matches.
+    @param search: (dict) Search index of dropdown column
+    @param query: (str) Lower-case search query
+    @return: (list) Option positions of prefix matches and substring matches (each in option order)
+    '''
+    lo, hi = np.searchsorted(search['prefix_keys'], [query, query + "\U0010ffff"])
+    prefix = np.sort(search['prefix_order'][lo:hi])
+
+    substring = np.empty(0, dtype=np.int64)
+    if len(query) >= 3:
+        postings = [search['trigrams'].get(query[j:j + 3]) for j in range(len(query) - 2)]
+        if all(p is not None for p in postings):
+            candidates = reduce(np.intersect1d, sorted(postings, key=len))
+            candidates = np.setdiff1d(candidates, prefix, assume_unique=True)
+            substring = candidates[np.char.find(search['keys'][candidates], query) >= 0]
+
+    return prefix, substring
+
+def search_filter_dropdown_options(dropdown_index, col, row_index, search_value, limit, value=None):
+    '''
+    Format dynamic filter options for dropdown from search index - top matches of search value among options of
+    filtered satellites (no sorting per call).
+    @param dropdown_index: (dict) Dropdown index with search index (see create_filter_search_index)
+    @param col: (str) Dropdown column - ObjectName or SatCatId
+    @param row_index: (array) Row positions of filtered satellites
+    @param search_value: (str) Dropdown search value (None or empty - first options in sort order)
+    @param limit: (int) Maximum number of options returned
+    @param value: (str) Current dropdown value - always included in options (optional)
+    @return: (list) Dropdown options
+    '''
+    options = dropdown_index[col]['options']
+    available = np.zeros(len(options), dtype=bool)
+    available[dropdown_index[col]['rank'][row_index]] = True
+
+    query = (search_value or "").strip().lower()
+    if query == "":
+        matches = np.flatnonzero(available)[:limit]
+    else:
+        prefix, substring = _search_option_positions(dropdown_index[col]['search'], query)
+        matches = np.concatenate((prefix[available[prefix]], substring[available[substring]]))[:limit]
+
+    filter_output = options[matches].tolist()
+    if value is not None and str(value) not in filter_output:
+        filter_output.insert(0, str(value))
 
     return filter_output
 
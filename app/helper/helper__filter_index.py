@@ -0,0 +1,417 @@
+"""
+
+This module defines a precomputed index of the satellite catalogue filter dimensions. Each dimension is encoded once
+at startup as integer category codes plus an inverted list of rows per category value, so a filter is evaluated as a
+few vectorised lookups over row positions instead of repeated isin scans and dataframe copies.
+
+Example:
+
+        $ python helper__filter_index.py
+
+Function:
+    create_purpose_index: Build bit-packed satellite x purpose membership matrix
+    create_filter_index: Build filter index for satellite catalogue dataframe
+    plan_filter_query: Order constrained filter dimensions by selectivity, skipping unconstrained dimensions
+    select_filter_rows: Evaluate filter against index and return selected row positions
+    compute_filter_mask: Evaluate one filter dimension over all rows
+    combine_filter_masks: Intersect filter dimension masks and return selected row positions
+    create_count_cube: Build sparse count cube over categorical filter dimensions
+    count_filter_rows: Count rows matching filter, in total or per category value of a dimension
+    create_filter_cache: Initialise LRU cache of filter results
+    get_filter_cache_rows: Get cached row positions for filter signature
+    put_filter_cache_rows: Store row positions for filter signature
+    clear_filter_cache: Remove all filter results from cache
+    get_filter_cache_stats: Get filter cache monitoring statistics
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import pandas as pd
+import numpy as np
+import threading
+from collections import OrderedDict
+
+# Internal modules
+from app.helper.helper__constants import (_filter_dimensions__c, _filter_index_sparse_fraction__c,
+                                          _count_cube_dimensions__c)
+
+def _create_dimension_index(values):
+    '''
+    Encode one filter dimension as category codes with an inverted list of rows per category value.
+
+    @param values: (array) column values of satellite catalogue
+    @return: (dict) dimension index - category values, lookup index, codes per row (-1 for missing values),
+        row count per category and rows grouped by category (order, start)
+    '''
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    dim = dict()
+    dim['values'] = np.asarray(uniques)
+    dim['lookup'] = pd.Index(np.asarray(uniques))
+    dim['codes'] = codes.astype(np.int32)
+    dim['counts'] = counts
+    dim['order'] = np.argsort(codes, kind='stable').astype(np.int32)
+    dim['start'] = np.int64(np.sum(codes < 0)) + np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+    return dim
+
+def create_purpose_index(purpose):
+    '''
+    Build bit-packed satellite x purpose membership matrix from '/'-separated purposes.
+
+    @param purpose: (array) Purpose column of satellite catalogue
+    @return: (dict) purpose index - sorted purpose values, lookup index, row count per purpose and N x ceil(P/8) uint8
+        membership matrix (bit j of row i set if satellite i has purpose j)
+    '''
+    exploded = pd.Series(purpose).dropna().str.split("/").explode()
+    values = np.sort(exploded.unique())
+    codes = np.searchsorted(values, exploded.values)
+
+    membership = np.zeros((len(purpose), len(values)), dtype=bool)
+    membership[exploded.index.values, codes] = True
+
+    purpose_index = dict()
+    purpose_index['values'] = values
+    purpose_index['lookup'] = pd.Index(values)
+    purpose_index['counts'] = membership.sum(axis=0)
+    purpose_index['membership'] = np.packbits(membership, axis=1)
+
+    return purpose_index
+
+def create_filter_index(df_in, dimensions=_filter_dimensions__c):
+    '''
+    Build filter index for satellite catalogue dataframe.
+
+    @param df_in: (DataFrame) satellite catalogue dataframe
+    @param dimensions: (tuple) columns to index
+    @return: (dict) filter index - number of rows, rows with complete catalogue data, index per dimension, purpose
+        membership matrix and count cube (all arrays read-only)
+    '''
+    filter_index = dict()
+    filter_index['size'] = df_in.shape[0]
+    filter_index['complete'] = df_in.notna().all(axis=1).values
+    filter_index['complete_rows'] = np.flatnonzero(filter_index['complete'])
+    filter_index['dimensions'] = {col: _create_dimension_index(df_in[col].values) for col in dimensions}
+    filter_index['purpose'] = create_purpose_index(df_in["Purpose"].values)
+    filter_index['count_cube'] = create_count_cube(filter_index,
+                                                   [col for col in _count_cube_dimensions__c
+                                                    if col == "Purpose" or col in dimensions])
+
+    # Index arrays are shared by all callbacks - read-only
+    for arr in [filter_index['complete'], filter_index['complete_rows']] + \
+               [v for dim in list(filter_index['dimensions'].values()) + [filter_index['purpose']]
+                for v in dim.values() if isinstance(v, np.ndarray)] + \
+               [filter_index['count_cube']['counts'], filter_index['count_cube']['purpose_combinations']] + \
+               list(filter_index['count_cube']['cells'].values()):
+        arr.setflags(write=False)
+
+    return filter_index
+
+def _get_dimension_index(filter_index, col):
+    '''
+    Get index of filter dimension (purpose membership index for Purpose).
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param col: (str) filter column
+    @return: (dict) dimension index
+    '''
+    return filter_index['purpose'] if col == "Purpose" else filter_index['dimensions'][col]
+
+def _select_category_codes(dim, vals):
+    '''
+    Map filter values to category codes of filter dimension.
+
+    @param dim: (dict) dimension index
+    @param vals: (list) filter values
+    @return: (array) unique category codes of filter values found in dimension (None if every category value is
+        selected - i.e. dimension is unconstrained)
+    '''
+    codes = dim['lookup'].get_indexer(np.asarray(vals))
+    codes = np.unique(codes[codes >= 0])
+    if len(codes) == len(dim['values']):
+        return None
+
+    return codes
+
+def plan_filter_query(filter_index, input_filter):
+    '''
+    Order constrained filter dimensions by selectivity. Dimensions whose filter values cover every category value
+    are unconstrained and skipped.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param input_filter: (dict) filter values per column
+    @return: (list) query steps - column, selected category codes and estimated number of rows - most selective first
+    '''
+    steps = []
+    for col, vals in input_filter.items():
+        dim = _get_dimension_index(filter_index, col)
+        codes = _select_category_codes(dim, vals)
+        if codes is None:
+            continue
+        steps.append(dict(column=col, codes=codes,
+                          rows=min(int(dim['counts'][codes].sum()), filter_index['size'])))
+
+    steps.sort(key=lambda step: step['rows'])
+
+    return steps
+
+def select_filter_rows(filter_index, input_filter):
+    '''
+    Evaluate filter against index and return selected row positions. The most selective dimension is read from its
+    inverted row lists when it selects few rows; remaining dimensions are applied as boolean lookups of category codes
+    over the candidate rows.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param input_filter: (dict) filter values per column
+    @return: (array) ascending row positions of satellite catalogue rows matching all filters (rows with missing
+        catalogue data are excluded)
+    '''
+    steps = plan_filter_query(filter_index, input_filter)
+    rows = filter_index['complete_rows']
+
+    for i, step in enumerate(steps):
+        col = step['column']
+
+        if col == "Purpose":
+            # Any-of test against bit-packed membership matrix
+            selected = np.zeros(len(filter_index['purpose']['values']), dtype=bool)
+            selected[step['codes']] = True
+            rows = rows[(filter_index['purpose']['membership'][rows] & np.packbits(selected)).any(axis=1)]
+            continue
+
+        dim = filter_index['dimensions'][col]
+        if i == 0 and step['rows'] < _filter_index_sparse_fraction__c * filter_index['size']:
+            # Sparse - union of inverted row lists, restricted to complete rows
+            candidates = np.sort(np.concatenate([dim['order'][dim['start'][c]:dim['start'][c] + dim['counts'][c]]
+                                                 for c in step['codes']] + [np.empty(0, dtype=np.int32)]))
+            rows = candidates[filter_index['complete'][candidates]]
+        else:
+            # Dense - lookup of selected category codes over candidate rows (missing values map to False)
+            selected = np.zeros(len(dim['values']) + 1, dtype=bool)
+            selected[step['codes']] = True
+            rows = rows[selected[dim['codes'][rows]]]
+
+        if len(rows) == 0:
+            break
+
+    return rows.astype(np.int64)
+
+def compute_filter_mask(filter_index, col, vals):
+    '''
+    Evaluate one filter dimension over all rows.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param col: (str) filter column
+    @param vals: (list) filter values
+    @return: (array) boolean mask of rows matching filter values (None if dimension is unconstrained)
+    '''
+    dim = _get_dimension_index(filter_index, col)
+    codes = _select_category_codes(dim, vals)
+    if codes is None:
+        return None
+
+    if col == "Purpose":
+        selected = np.zeros(len(dim['values']), dtype=bool)
+        selected[codes] = True
+        return (dim['membership'] & np.packbits(selected)).any(axis=1)
+
+    selected = np.zeros(len(dim['values']) + 1, dtype=bool)
+    selected[codes] = True
+    return selected[dim['codes']]
+
+def combine_filter_masks(filter_index, masks):
+    '''
+    Intersect filter dimension masks and return selected row positions.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param masks: (list) boolean row masks of constrained filter dimensions
+    @return: (array) ascending row positions of satellite catalogue rows matching all masks (rows with missing
+        catalogue data are excluded)
+    '''
+    combined = filter_index['complete'].copy()
+    for mask in masks:
+        combined &= mask
+
+    return np.flatnonzero(combined)
+
+def create_count_cube(filter_index, dimensions=_count_cube_dimensions__c):
+    '''
+    Build sparse count cube over categorical filter dimensions - the number of complete catalogue rows per non-empty
+    combination of category codes. Purpose is multi-valued, so its cube dimension is the satellite's combination of
+    purposes.
+
+    @param filter_index: (dict) filter index created by create_filter_index (cube is not added to it)
+    @param dimensions: (list) filter columns of cube
+    @return: (dict) count cube - category codes per dimension of each cell, row count per cell and bit-packed
+        membership matrix of purpose combinations
+    '''
+    rows = filter_index['complete_rows']
+    purpose_combinations, purpose_codes = np.unique(filter_index['purpose']['membership'][rows], axis=0,
+                                                    return_inverse=True)
+
+    codes = np.stack([purpose_codes.reshape(-1) if col == "Purpose" else filter_index['dimensions'][col]['codes'][rows]
+                      for col in dimensions]).astype(np.int32)
+    cells, counts = np.unique(codes, axis=1, return_counts=True)
+
+    count_cube = dict()
+    count_cube['cells'] = {col: cells[i] for i, col in enumerate(dimensions)}
+    count_cube['counts'] = counts.astype(np.int64)
+    count_cube['purpose_combinations'] = purpose_combinations
+
+    return count_cube
+
+def _select_count_cube_cells(filter_index, input_filter):
+    '''
+    Select cells of count cube matching filter.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param input_filter: (dict) filter values per column
+    @return: (array) boolean mask of matching cells (None if filter constrains a dimension outside the cube)
+    '''
+    count_cube = filter_index['count_cube']
+    selected_cells = np.ones(len(count_cube['counts']), dtype=bool)
+
+    for col, vals in input_filter.items():
+        dim = _get_dimension_index(filter_index, col)
+        codes = _select_category_codes(dim, vals)
+        if codes is None:
+            continue
+        if col not in count_cube['cells']:
+            return None
+
+        if col == "Purpose":
+            # Any-of test against membership of purpose combinations
+            selected = np.zeros(len(dim['values']), dtype=bool)
+            selected[codes] = True
+            selected = (count_cube['purpose_combinations'] & np.packbits(selected)).any(axis=1)
+        else:
+            selected = np.zeros(len(dim['values']), dtype=bool)
+            selected[codes] = True
+        selected_cells &= selected[count_cube['cells'][col]]
+
+    return selected_cells
+
+def count_filter_rows(filter_index, input_filter, by=None):
+    '''
+    Count rows matching filter, in total or per category value of a dimension. Counts are summed from the count cube
+    when every constrained dimension (and the breakdown dimension) is a cube dimension, otherwise from selected rows.
+
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param input_filter: (dict) filter values per column
+    @param by: (str) filter column to break counts down by (optional - total count if None). For Purpose, rows are
+        counted once per purpose they have
+    @return: (int) number of matching rows if by is None, else (array) number of matching rows per category value
+        of dimension (aligned to the dimension index 'values')
+    '''
+    count_cube = filter_index['count_cube']
+    selected_cells = _select_count_cube_cells(filter_index, input_filter)
+
+    if selected_cells is not None and (by is None or by in count_cube['cells']):
+        # Sum cube cells
+        counts = count_cube['counts'][selected_cells]
+        if by is None:
+            return int(counts.sum())
+        codes = count_cube['cells'][by][selected_cells]
+        membership = count_cube['purpose_combinations']
+    else:
+        # Scan selected rows
+        rows = select_filter_rows(filter_index, input_filter)
+        if by is None:
+            return len(rows)
+        counts = np.ones(len(rows), dtype=np.int64)
+        codes = np.arange(len(rows)) if by == "Purpose" else filter_index['dimensions'][by]['codes'][rows]
+        membership = filter_index['purpose']['membership'][rows]
+
+    dim = _get_dimension_index(filter_index, by)
+    if by == "Purpose":
+        membership = np.unpackbits(membership, axis=1, count=len(dim['values']))
+        return (counts @ membership[codes]).astype(np.int64)
+
+    return np.bincount(codes, weights=counts, minlength=len(dim['values'])).astype(np.int64)
+
+def create_filter_cache(max_size):
+    '''
+    Initialise LRU cache of filter results (selected row positions keyed by filter signature). Pinned results (e.g.
+    precomputed filter presets) are held separately and never evicted.
+
+    @param max_size: (int) maximum number of filter results held in cache
+    @return: (dict) filter cache
+    '''
+    filter_cache = dict()
+    filter_cache['max_size'] = max_size
+    filter_cache['results'] = OrderedDict()
+    filter_cache['pinned'] = dict()
+    filter_cache['lock'] = threading.Lock()
+    filter_cache['stats'] = dict(hits=0, misses=0)
+
+    return filter_cache
+
+def get_filter_cache_rows(filter_cache, signature):
+    '''
+    Get cached row positions for filter signature.
+
+    @param filter_cache: (dict) filter cache
+    @param signature: (tuple) canonical filter signature
+    @return: (array) row positions (None if not cached)
+    '''
+    with filter_cache['lock']:
+        if signature in filter_cache['pinned']:
+            filter_cache['stats']['hits'] += 1
+            return filter_cache['pinned'][signature]
+        results = filter_cache['results']
+        if signature in results:
+            results.move_to_end(signature)
+            filter_cache['stats']['hits'] += 1
+            return results[signature]
+        filter_cache['stats']['misses'] += 1
+
+    return None
+
+def put_filter_cache_rows(filter_cache, signature, row_index, pinned=False):
+    '''
+    Store row positions for filter signature, evicting least recently used results above maximum cache size.
+
+    @param filter_cache: (dict) filter cache
+    @param signature: (tuple) canonical filter signature
+    @param row_index: (array) row positions (should be read-only - shared by all callers)
+    @param pinned: (bool) pin result in cache - never evicted until cache is cleared
+    '''
+    with filter_cache['lock']:
+        if pinned:
+            filter_cache['pinned'][signature] = row_index
+            return
+        results = filter_cache['results']
+        results[signature] = row_index
+        results.move_to_end(signature)
+        while len(results) > filter_cache['max_size']:
+            results.popitem(last=False)
+
+def clear_filter_cache(filter_cache):
+    '''
+    Remove all filter results from cache.
+
+    @param filter_cache: (dict) filter cache
+    '''
+    with filter_cache['lock']:
+        filter_cache['results'].clear()
+        filter_cache['pinned'].clear()
+
+def get_filter_cache_stats(filter_cache):
+    '''
+    Get filter cache monitoring statistics.
+
+    @param filter_cache: (dict) filter cache
+    @return: (dict) hits, misses, hit rate, number of cached results and number of pinned results
+    '''
+    with filter_cache['lock']:
+        stats = dict(filter_cache['stats'])
+        stats['size'] = len(filter_cache['results'])
+        stats['pinned'] = len(filter_cache['pinned'])
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups > 0 else None
+
+    return stats
@@ -0,0 +1,134 @@
+"""
+
+This module defines a URL-encodable filter query language mirroring the filter sidebar controls, e.g.
+
+    status=Active&orbit=LEO,GEO&owner=USA&year=2015-2025
+    preset=active-leo&year=2020-2025
+
+and named filter presets whose selected rows are precomputed at startup.
+
+Example:
+
+        $ python helper__filter_query.py
+
+Function:
+    create_default_filter_inputs: Create filter inputs of sidebar controls when the page is first loaded
+    parse_filter_query: Parse filter query string into filter inputs
+    encode_filter_query: Encode filter inputs as filter query string
+    create_filter_presets: Parse named filter presets and precompute their selected rows
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+from urllib.parse import parse_qs, urlencode
+
+# Internal modules
+from app.helper.helper__app_data import select_satellite_rows, create_filter_signature
+from app.helper.helper__filter_index import put_filter_cache_rows
+
+_filter_query_list_keys = ["status", "orbit", "owner", "launchvehicle", "purpose"]
+_filter_query_keys = _filter_query_list_keys + ["satname", "satcatid", "year", "preset"]
+
+def create_default_filter_inputs(options):
+    '''
+    Create filter inputs of sidebar controls when the page is first loaded.
+
+    @param options: (dict) filter options created by create_data_filters
+    @return: (dict) filter inputs - status, orbit, satname, satcatid, owner, launchvehicle, purpose and year
+    '''
+    return dict(status=["Active"], orbit=["LEO", "GEO"], satname=None, satcatid=None,
+                owner=[], launchvehicle=[], purpose=[], year=[int(y) for y in options["launchyear"]])
+
+def parse_filter_query(query, options, presets=None):
+    '''
+    Parse filter query string into filter inputs. Controls missing from the query keep their default values (or the
+    values of the named preset, if one is given).
+
+    @param query: (str) filter query string, e.g. "status=Active&orbit=LEO,GEO&year=2015-2025" (leading "?" allowed)
+    @param options: (dict) filter options created by create_data_filters
+    @param presets: (dict) named filter presets created by create_filter_presets (optional)
+    @return: (dict) filter inputs - status, orbit, satname, satcatid, owner, launchvehicle, purpose and year
+    '''
+    params = {k: v[-1] for k, v in parse_qs((query or "").lstrip("?"), keep_blank_values=True).items()}
+
+    unknown = set(params) - set(_filter_query_keys)
+    if unknown:
+        raise ValueError(f"Unknown filter query keys: {', '.join(sorted(unknown))}")
+
+    # Start from preset or sidebar defaults
+    if "preset" in params:
+        if presets is None or params["preset"] not in presets:
+            raise ValueError(f"Unknown filter preset: {params['preset']}")
+        filter_inputs = dict(presets[params["preset"]]['inputs'])
+    else:
+        filter_inputs = create_default_filter_inputs(options)
+
+    for key in _filter_query_list_keys:
+        if key in params:
+            filter_inputs[key] = [v.strip() for v in params[key].split(",") if v.strip() != ""]
+
+    if "satname" in params:
+        filter_inputs["satname"] = params["satname"] or None
+
+    if "satcatid" in params:
+        if params["satcatid"] != "" and not params["satcatid"].isdigit():
+            raise ValueError(f"Invalid SATCAT number: {params['satcatid']}")
+        filter_inputs["satcatid"] = params["satcatid"] or None
+
+    if "year" in params:
+        years = params["year"].split("-")
+        if len(years) not in [1, 2] or not all(y.strip().isdigit() for y in years):
+            raise ValueError(f"Invalid launch year range: {params['year']}")
+        filter_inputs["year"] = [int(years[0]), int(years[-1])]
+
+    return filter_inputs
+
+def encode_filter_query(filter_inputs, options):
+    '''
+    Encode filter inputs as filter query string (controls at their default values are omitted).
+
+    @param filter_inputs: (dict) filter inputs - status, orbit, satname, satcatid, owner, launchvehicle, purpose
+        and year
+    @param options: (dict) filter options created by create_data_filters
+    @return: (str) filter query string
+    '''
+    defaults = create_default_filter_inputs(options)
+
+    params = dict()
+    for key in _filter_query_list_keys:
+        if sorted(filter_inputs[key]) != sorted(defaults[key]):
+            params[key] = ",".join(filter_inputs[key])
+    for key in ["satname", "satcatid"]:
+        if filter_inputs[key] is not None:
+            params[key] = str(filter_inputs[key])
+    if list(filter_inputs["year"]) != defaults["year"]:
+        params["year"] = f"{filter_inputs['year'][0]}-{filter_inputs['year'][1]}"
+
+    return urlencode(params, safe=",")
+
+def create_filter_presets(filter_presets, options, df_in, input_filter, filter_index, filter_cache=None):
+    '''
+    Parse named filter presets and precompute their selected rows. If a filter cache is given, preset results are
+    pinned in it (never evicted) so that callbacks with the same filter inputs are served the precomputed rows.
+
+    @param filter_presets: (dict) filter query string per preset name
+    @param options: (dict) filter options created by create_data_filters
+    @param df_in: (DataFrame) satellite catalogue dataframe
+    @param input_filter: (dict) initial filter dictionary created by create_data_filters
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param filter_cache: (dict) filter cache created by create_filter_cache (optional)
+    @return: (dict) presets - per preset name, query string, filter inputs and selected row positions
+    '''
+    presets = dict()
+    for name, query in filter_presets.items():
+        filter_inputs = parse_filter_query(query, options)
+        row_index = select_satellite_rows(df_in, input_filter, **filter_inputs, filter_index=filter_index)
+
+        presets[name] = dict(query=query, inputs=filter_inputs, row_index=row_index)
+        if filter_cache is not None:
+            put_filter_cache_rows(filter_cache, create_filter_signature(**filter_inputs), row_index, pinned=True)
+
+    return presets
@@ -0,0 +1,136 @@
+"""
+
+This module defines a server-side store of per-session filter state. Each browser session keeps one boolean row mask
+per filter dimension; when a filter input changes (e.g. the launch year slider is dragged) only the masks of changed
+dimensions are recomputed and the masks are re-intersected.
+
+Example:
+
+        $ python helper__filter_session.py
+
+Function:
+    create_filter_session_store: Initialise store of per-session filter state
+    get_filter_session: Get filter state of session, creating it if needed
+    select_filter_rows_session: Incrementally re-evaluate filter for session and return selected row positions
+    clear_filter_sessions: Remove all sessions from store
+    get_filter_session_stats: Get filter session store monitoring statistics
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import threading
+import time
+from collections import OrderedDict
+
+# Internal modules
+from app.helper.helper__filter_index import compute_filter_mask, combine_filter_masks
+
+def create_filter_session_store(max_sessions, ttl):
+    '''
+    Initialise store of per-session filter state.
+
+    @param max_sessions: (int) maximum number of sessions held in store
+    @param ttl: (float) time in seconds a session may be idle before it is evicted
+    @return: (dict) filter session store
+    '''
+    filter_session_store = dict()
+    filter_session_store['max_sessions'] = max_sessions
+    filter_session_store['ttl'] = ttl
+    filter_session_store['sessions'] = OrderedDict()
+    filter_session_store['lock'] = threading.Lock()
+    filter_session_store['stats'] = dict(recomputed=0, reused=0)
+
+    return filter_session_store
+
+def _evict_filter_sessions(filter_session_store, now):
+    '''
+    Evict idle sessions and least recently used sessions above maximum store size.
+
+    @param filter_session_store: (dict) filter session store
+    @param now: (float) current monotonic time
+    '''
+    sessions = filter_session_store['sessions']
+    for session_id in [k for k, v in sessions.items() if now - v['last_used'] > filter_session_store['ttl']]:
+        del sessions[session_id]
+    while len(sessions) > filter_session_store['max_sessions']:
+        sessions.popitem(last=False)
+
+def get_filter_session(filter_session_store, session_id):
+    '''
+    Get filter state of session, creating it if needed.
+
+    @param filter_session_store: (dict) filter session store
+    @param session_id: (str) session id
+    @return: (dict) session filter state - key, values and row mask per filter dimension
+    '''
+    with filter_session_store['lock']:
+        now = time.monotonic()
+        sessions = filter_session_store['sessions']
+        if session_id not in sessions:
+            sessions[session_id] = dict(keys=dict(), values=dict(), masks=dict(), lock=threading.Lock())
+        session = sessions[session_id]
+        session['last_used'] = now
+        sessions.move_to_end(session_id)
+        _evict_filter_sessions(filter_session_store, now)
+
+    return session
+
+def select_filter_rows_session(filter_session_store, session_id, filter_index, input_filter, dimension_keys):
+    '''
+    Incrementally re-evaluate filter for session and return selected row positions. The row mask of a filter
+    dimension is only recomputed if its key differs from the key it was last computed with in this session.
+
+    @param filter_session_store: (dict) filter session store
+    @param session_id: (str) session id
+    @param filter_index: (dict) filter index created by create_filter_index
+    @param input_filter: (dict) filter values per column
+    @param dimension_keys: (dict) hashable key of filter values per column (e.g. from filter signature) - columns
+        without a key are compared by identity of their filter values
+    @return: (array) ascending row positions of satellite catalogue rows matching all filters
+    '''
+    session = get_filter_session(filter_session_store, session_id)
+
+    recomputed = 0
+    with session['lock']:
+        for col, vals in input_filter.items():
+            key = dimension_keys.get(col, id(vals))
+            if col in session['keys'] and session['keys'][col] == key:
+                continue
+            session['masks'][col] = compute_filter_mask(filter_index, col, vals)
+            session['keys'][col] = key
+            session['values'][col] = vals # keep filter values referenced so identity keys stay valid
+            recomputed += 1
+
+        masks = [session['masks'][col] for col in input_filter.keys() if session['masks'][col] is not None]
+        row_index = combine_filter_masks(filter_index, masks)
+
+    with filter_session_store['lock']:
+        filter_session_store['stats']['recomputed'] += recomputed
+        filter_session_store['stats']['reused'] += len(input_filter) - recomputed
+
+    return row_index
+
+def clear_filter_sessions(filter_session_store):
+    '''
+    Remove all sessions from store.
+
+    @param filter_session_store: (dict) filter session store
+    '''
+    with filter_session_store['lock']:
+        filter_session_store['sessions'].clear()
+
+def get_filter_session_stats(filter_session_store):
+    '''
+    Get filter session store monitoring statistics.
+
+    @param filter_session_store: (dict) filter session store
+    @return: (dict) number of sessions and number of filter dimension masks recomputed and reused
+    '''
+    with filter_session_store['lock']:
+        stats = dict(filter_session_store['stats'])
+        stats['sessions'] = len(filter_session_store['sessions'])
+
+    return stats
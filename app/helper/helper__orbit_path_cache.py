@@ -0,0 +1,292 @@
+"""
+
+This module defines process-wide caches of satellite orbit paths, keyed by satellite, TLE epoch and resolution.
+
+3D orbit paths are held in the inertial (TEME) frame over one orbital period. As the orbit shape only changes slowly
+in the inertial frame, a cached path is reused on every refresh by shifting its phase to the current time and
+applying the current Earth rotation (GMST) - no propagation is needed until the path expires.
+
+2D ground tracks are held as geodetic samples on a fixed time grid. The grid is extended lazily as time advances, so
+each sample is propagated once and clients only need to be sent samples they do not already have (and told which
+past samples to drop).
+
+Example:
+
+        $ python helper__orbit_path_cache.py
+
+Function:
+    create_orbit_path_cache: Initialise LRU cache of inertial orbit paths
+    compute_orbit_path: Propagate inertial orbit path of satellite over one orbital period
+    get_orbit_path: Get orbit path of satellite in 3D scene coordinates at current time
+    compute_ground_track: Propagate geodetic ground track samples of satellite on a fixed time grid
+    get_ground_track_update: Get ground track samples missing from a client's 2D ground track and past samples to drop
+    clear_orbit_path_cache: Remove all paths from cache
+    get_orbit_path_cache_stats: Get orbit path cache monitoring statistics
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import numpy as np
+import threading
+import time
+from collections import OrderedDict
+
+# Internal modules
+from app.helper.helper__satellite_position import (get_satrec_store_index, teme_to_scene, compute_gmst,
+                                                   datetime64_to_jday, compute_satloc_path)
+from app.helper.helper__ephemeris import get_ephemeris_positions
+from app.helper.helper__constants import (_radius_earth__c, _ground_track_extension__c,
+                                          _ground_track_max_drop__c)
+
+def create_orbit_path_cache(max_bytes, ttl):
+    '''
+    Initialise LRU cache of inertial orbit paths or ground tracks (keyed by SATCAT number, TLE epoch and resolution).
+
+    @param max_bytes: (int) maximum memory of paths held in cache (bytes)
+    @param ttl: (float) time in seconds before a path is evicted and re-propagated (bounds drift of the cached
+        inertial path, e.g. nodal precession, and growth of ground track sample grids)
+    @return: (dict) orbit path cache
+    '''
+    orbit_path_cache = dict()
+    orbit_path_cache['max_bytes'] = max_bytes
+    orbit_path_cache['ttl'] = ttl
+    orbit_path_cache['paths'] = OrderedDict()
+    orbit_path_cache['nbytes'] = 0
+    orbit_path_cache['lock'] = threading.Lock()
+    orbit_path_cache['stats'] = dict(hits=0, misses=0)
+
+    return orbit_path_cache
+
+def compute_orbit_path(satrec_store, sat_pos, start, period, n_samples):
+    '''
+    Propagate inertial orbit path of satellite over one orbital period. Positions are read from the store's Chebyshev
+    ephemeris (satrec_store['ephemeris']) when one has been fitted.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param sat_pos: (int) satellite store position
+    @param start: (datetime64) UTC epoch of first sample
+    @param period: (float) orbital period (minutes)
+    @param n_samples: (int) number of samples - evenly spaced over [0, period)
+    @return: n_samples x 3 floating point array of x, y, z positions in TEME (NaN where propagation failed)
+    '''
+    orbit_dt_us = np.arange(n_samples) * (period * 60e6 / n_samples)
+    jd, fr = datetime64_to_jday(np.datetime64(start, "us") + orbit_dt_us.astype("timedelta64[us]"))
+
+    if satrec_store.get('ephemeris') is not None:
+        return get_ephemeris_positions(satrec_store['ephemeris'], jd, fr, [sat_pos])[0]
+
+    e, teme_p, _ = satrec_store['satrec'][sat_pos].sgp4_array(jd, fr)
+    teme_p[e != 0] = np.nan
+
+    return teme_p
+
+def _evict_orbit_paths(orbit_path_cache, now):
+    '''
+    Evict expired paths and least recently used paths above maximum cache memory.
+
+    @param orbit_path_cache: (dict) orbit path cache
+    @param now: (float) current monotonic time
+    '''
+    paths = orbit_path_cache['paths']
+    for key in [k for k, v in paths.items() if now - v['created'] > orbit_path_cache['ttl']]:
+        orbit_path_cache['nbytes'] -= paths.pop(key)['nbytes']
+    while len(paths) > 0 and orbit_path_cache['nbytes'] > orbit_path_cache['max_bytes']:
+        orbit_path_cache['nbytes'] -= paths.popitem(last=False)[1]['nbytes']
+
+def get_orbit_path(orbit_path_cache, satrec_store, satcat_id, period, res, time_in):
+    '''
+    Get orbit path of satellite in 3D scene coordinates at current time - one orbital period starting at the current
+    position (first and last points coincide). The inertial path is propagated once per satellite, TLE epoch and
+    resolution; each call only shifts its phase to the current time (interpolating between samples), joins it at the
+    exact current position and rotates it by the current GMST.
+
+    @param orbit_path_cache: (dict) orbit path cache (None - path is propagated without caching)
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param satcat_id: (int) SATCAT number of satellite
+    @param period: (float) orbital period (minutes)
+    @param res: (int) number of points in path (resolution)
+    @param time_in: (datetime) UTC datetime of current position
+    @return: res x 3 floating point array of x, y, z positions in 3D scene coordinates
+    '''
+    sat_pos = get_satrec_store_index(satrec_store, [satcat_id])[0]
+    satrec = satrec_store['satrec'][sat_pos]
+    time_in = np.datetime64(time_in, "us")
+    n_samples = res - 1
+
+    if orbit_path_cache is None:
+        entry = dict(start=time_in, period=period, teme=compute_orbit_path(satrec_store, sat_pos, time_in, period,
+                                                                           n_samples))
+    else:
+        key = (int(satcat_id), satrec.jdsatepoch + satrec.jdsatepochF, res)
+        with orbit_path_cache['lock']:
+            now = time.monotonic()
+            _evict_orbit_paths(orbit_path_cache, now)
+
+            paths = orbit_path_cache['paths']
+            if key in paths:
+                paths.move_to_end(key)
+                orbit_path_cache['stats']['hits'] += 1
+                entry = paths[key]
+            else:
+                orbit_path_cache['stats']['misses'] += 1
+                teme = compute_orbit_path(satrec_store, sat_pos, time_in, period, n_samples)
+                teme.setflags(write=False)
+
+                entry = dict(created=now, start=time_in, period=period, teme=teme, nbytes=teme.nbytes)
+                paths[key] = entry
+                orbit_path_cache['nbytes'] += teme.nbytes
+                _evict_orbit_paths(orbit_path_cache, now)
+
+    # Shift phase of inertial path to current time (linear interpolation between samples)
+    elapsed_s = (time_in - entry['start']) / np.timedelta64(1, "s")
+    phase = elapsed_s / (entry['period'] * 60. / n_samples)
+    shift, frac = int(np.floor(phase)), phase - np.floor(phase)
+    teme = np.roll(entry['teme'], -(shift % n_samples), axis=0)
+    teme = (1 - frac) * teme + frac * np.roll(teme, -1, axis=0)
+
+    # Close orbit at exact current position, so the path starts at the satellite marker
+    seam = compute_orbit_path(satrec_store, sat_pos, time_in, period, 1)
+    teme = np.concatenate((seam, teme[1:], seam), axis=0)
+
+    # Rotate by current Earth orientation
+    return teme_to_scene(teme, compute_gmst(*datetime64_to_jday(time_in)))
+
+def compute_ground_track(satrec_store, sat_pos, origin, step_us, start_index, end_index):
+    '''
+    Propagate geodetic ground track samples of satellite on a fixed time grid - sample i is at origin + i * step.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param sat_pos: (int) satellite store position
+    @param origin: (datetime64) UTC epoch of sample 0
+    @param step_us: (float) time between samples (microseconds)
+    @param start_index: (int) first sample
+    @param end_index: (int) end sample (exclusive)
+    @return: (end_index - start_index) x 3 floating point array of latitude, longitude and altitude
+    '''
+    sample_us = np.arange(start_index, end_index) * step_us
+    jd, fr = datetime64_to_jday(origin + sample_us.astype("timedelta64[us]"))
+
+    teme_p = None
+    if satrec_store.get('ephemeris') is not None:
+        teme_p = get_ephemeris_positions(satrec_store['ephemeris'], jd, fr, [sat_pos])[0]
+
+    return compute_satloc_path(satrec_store['satrec'][sat_pos], jd, fr, _radius_earth__c, False, teme_p)[:, 3:]
+
+def get_ground_track_update(ground_track_cache, satrec_store, satcat_id, period, res, time_in, track_mem=None,
+                            extension=_ground_track_extension__c, max_drop=_ground_track_max_drop__c):
+    '''
+    Get ground track samples missing from a client's 2D ground track and past samples to drop from it. The client's
+    track starts at the current time and must reach one orbital period (res points) ahead; when it falls short, it is
+    extended by the missing samples plus an extension so that it is only extended every few ticks. The whole track is
+    re-sent (starting at the current time) for a new satellite, TLE or sample grid, or when more than max_drop of
+    the client's track has passed (e.g. after the 2D tab was hidden).
+
+    @param ground_track_cache: (dict) ground track cache created by create_orbit_path_cache
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param satcat_id: (int) SATCAT number of satellite
+    @param period: (float) orbital period (minutes)
+    @param res: (int) number of samples per orbital period (resolution)
+    @param time_in: (datetime) UTC datetime of current position
+    @param track_mem: (dict) ground track held by client - 'key' of sample grid and sample range 'start'/'end' (as
+        returned by a previous call, None if client has no ground track)
+    @param extension: (float) fraction of orbital period added to each update
+    @param max_drop: (float) maximum fraction of orbital period of past samples dropped from client's ground track
+    @return ground_track: (dict) samples to send - 'extend' (append to client's track, else replace it), 'drop'
+        (number of past samples to remove from start of client's track), 'time' (datetime64), 'lat', 'lon' and 'alt'
+        (None if client's track is up to date)
+    @return track_mem: (dict) ground track held by client after update
+    '''
+    sat_pos = get_satrec_store_index(satrec_store, [satcat_id])[0]
+    satrec = satrec_store['satrec'][sat_pos]
+    time_in = np.datetime64(time_in, "us")
+    cache_key = (int(satcat_id), satrec.jdsatepoch + satrec.jdsatepochF, res)
+
+    with ground_track_cache['lock']:
+        now = time.monotonic()
+        _evict_orbit_paths(ground_track_cache, now)
+
+        tracks = ground_track_cache['paths']
+        if cache_key in tracks:
+            tracks.move_to_end(cache_key)
+            ground_track_cache['stats']['hits'] += 1
+            entry = tracks[cache_key]
+        else:
+            ground_track_cache['stats']['misses'] += 1
+            entry = dict(created=now, origin=time_in, step_us=period * 60e6 / (res - 1), first=0,
+                         samples=np.empty((0, 3)), nbytes=0)
+            tracks[cache_key] = entry
+
+        # Sample grid of client's track - SATCAT number, TLE epoch, resolution and grid origin
+        key = [cache_key[0], cache_key[1], res, str(entry['origin'])]
+        now_index = int(np.ceil((time_in - entry['origin']) / np.timedelta64(1, "us") / entry['step_us']))
+        end_index = now_index + res - 1
+
+        # Past samples of client's track (extend client's track if it still reaches the current time)
+        drop = now_index - track_mem['start'] if track_mem is not None else 0
+        extend = (track_mem is not None and track_mem['key'] == key and now_index <= track_mem['end']
+                  and drop <= max_drop * (res - 1))
+
+        if extend and track_mem['end'] >= end_index:
+            # Client's track is up to date
+            if drop <= 0:
+                return None, track_mem
+            start_index = end_index = track_mem['end']
+        elif extend:
+            start_index, end_index = track_mem['end'], end_index + int(np.ceil(extension * (res - 1)))
+        else:
+            start_index, end_index = now_index, end_index + int(np.ceil(extension * (res - 1)))
+
+        # Extend cached samples lazily - samples older than one orbital period are dropped
+        last_index = entry['first'] + len(entry['samples'])
+        if start_index >= entry['first'] and end_index > last_index:
+            first_index = max(entry['first'], min(start_index, now_index - (res - 1)))
+            new_samples = compute_ground_track(satrec_store, sat_pos, entry['origin'], entry['step_us'],
+                                               max(last_index, first_index), end_index)
+            entry['samples'] = np.concatenate((entry['samples'][first_index - entry['first']:], new_samples))
+            entry['first'] = first_index
+            ground_track_cache['nbytes'] += entry['samples'].nbytes - entry['nbytes']
+            entry['nbytes'] = entry['samples'].nbytes
+            _evict_orbit_paths(ground_track_cache, now)
+
+        if start_index >= entry['first']:
+            samples = entry['samples'][start_index - entry['first']:end_index - entry['first']]
+        else:
+            samples = compute_ground_track(satrec_store, sat_pos, entry['origin'], entry['step_us'],
+                                           start_index, end_index)
+        sample_us = np.arange(start_index, end_index) * entry['step_us']
+        ground_track = dict(extend=extend, drop=max(drop, 0) if extend else 0,
+                            time=entry['origin'] + sample_us.astype("timedelta64[us]"),
+                            lat=samples[:, 0], lon=samples[:, 1], alt=samples[:, 2])
+
+    track_mem = dict(key=key, start=max(now_index, track_mem['start']) if extend else start_index, end=end_index)
+
+    return ground_track, track_mem
+
+def clear_orbit_path_cache(orbit_path_cache):
+    '''
+    Remove all paths from cache.
+
+    @param orbit_path_cache: (dict) orbit path cache
+    '''
+    with orbit_path_cache['lock']:
+        orbit_path_cache['paths'].clear()
+        orbit_path_cache['nbytes'] = 0
+
+def get_orbit_path_cache_stats(orbit_path_cache):
+    '''
+    Get orbit path cache monitoring statistics.
+
+    @param orbit_path_cache: (dict) orbit path cache
+    @return: (dict) hits, misses, hit rate, number of cached paths and memory of cached paths (bytes)
+    '''
+    with orbit_path_cache['lock']:
+        stats = dict(orbit_path_cache['stats'])
+        stats['size'] = len(orbit_path_cache['paths'])
+        stats['nbytes'] = orbit_path_cache['nbytes']
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups > 0 else None
+
+    return stats
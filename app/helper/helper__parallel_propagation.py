@@ -0,0 +1,214 @@
+"""
+
+This module defines a process-pool propagation backend for large satellite catalogues (e.g. the full SATCAT including
+debris and rocket bodies). The catalogue is split into contiguous chunks which are propagated by worker processes;
+results are written straight into a shared-memory NumPy array so that no large arrays are pickled between processes.
+Below a size threshold, propagation falls back to a single SatrecArray call in the current process.
+
+Example:
+
+        $ python -m app.helper.helper__parallel_propagation
+
+Function:
+    create_propagation_pool: Start worker processes holding parsed TLEs and attach shared-memory output buffer
+    close_propagation_pool: Shut down worker processes and release shared memory
+    propagate_satloc_chunked: Propagate full catalogue at a single datetime across the process pool
+    propagate_catalogue: Propagate full catalogue, choosing single-process or process-pool backend by size
+    benchmark_propagation_backends: Time single-process and process-pool backends over catalogue sizes
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import numpy as np
+import pandas as pd
+import os
+import atexit
+import threading
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from datetime import datetime
+from sgp4.api import Satrec, SatrecArray
+
+# Internal modules
+from app.helper.helper__satellite_position import compute_satloc
+from app.helper.helper__constants import _radius_earth__c
+
+# Worker process state (set by _init_propagation_worker)
+_worker_tle = None
+_worker_shm = None
+_worker_out = None
+_worker_satrec_arrays = dict()
+
+def _init_propagation_worker(tle_in, shm_name, n_sat):
+    '''
+    Worker process initialiser - keep TLEs and attach shared-memory output buffer.
+
+    @param tle_in: (array) N x 2 string array - contains TLE1 and TLE2 data in the respective columns
+    @param shm_name: (str) name of shared-memory block
+    @param n_sat: (int) number of satellites in catalogue
+    '''
+    global _worker_tle, _worker_shm, _worker_out
+    _worker_tle = tle_in
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_out = np.ndarray((n_sat, 6), dtype=np.float64, buffer=_worker_shm.buf)
+
+def _propagate_chunk(start, stop, time_in, re):
+    '''
+    Worker task - propagate catalogue rows [start, stop) and write into shared-memory output buffer. TLEs for a
+    chunk are parsed on first use and reused on later calls.
+
+    @param start: (int) first catalogue row of chunk
+    @param stop: (int) last catalogue row of chunk (exclusive)
+    @param time_in: (datetime) UTC datetime
+    @param re: (float) Earth radius
+    @return: (int) number of satellites propagated
+    '''
+    if (start, stop) not in _worker_satrec_arrays:
+        _worker_satrec_arrays[(start, stop)] = SatrecArray([Satrec.twoline2rv(t[0], t[1])
+                                                            for t in _worker_tle[start:stop]])
+    _worker_out[start:stop] = compute_satloc(_worker_satrec_arrays[(start, stop)], time_in, re, False)
+    return stop - start
+
+def create_propagation_pool(tle_in, n_workers=None, chunk_size=None):
+    '''
+    Start worker processes holding parsed TLEs and attach shared-memory output buffer. Workers are forked, so the
+    pool must be created at startup before the process has started any other threads (e.g. server request threads).
+
+    @param tle_in: (array) N x 2 string array - contains TLE1 and TLE2 data in the respective columns
+    @param n_workers: (int) number of worker processes (optional - default number of CPUs)
+    @param chunk_size: (int) number of satellites per task (optional - default one chunk per worker)
+    @return: (dict) propagation pool
+    '''
+    if threading.active_count() > 1:
+        raise RuntimeError("Propagation pool must be created before other threads are started (workers are forked)")
+
+    tle_in = np.asarray(tle_in, dtype=object)
+    n_sat = tle_in.shape[0]
+    n_workers = n_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or int(np.ceil(n_sat / n_workers))
+
+    # Shared output buffer - N x 6 (x, y, z, lat, lon, alt)
+    shm = shared_memory.SharedMemory(create=True, size=max(n_sat, 1) * 6 * np.dtype(np.float64).itemsize)
+
+    # Fork - workers inherit TLEs without pickling and do not re-import the app entry point (spawn would)
+    executor = ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("fork"),
+                                   initializer=_init_propagation_worker, initargs=(tle_in, shm.name, n_sat))
+
+    pool = dict()
+    pool['executor'] = executor
+    pool['shm'] = shm
+    pool['out'] = np.ndarray((n_sat, 6), dtype=np.float64, buffer=shm.buf)
+    pool['n_sat'] = n_sat
+    pool['n_workers'] = n_workers
+    pool['chunks'] = [(start, min(start + chunk_size, n_sat)) for start in range(0, n_sat, chunk_size)]
+    pool['lock'] = threading.Lock()
+
+    # Start all workers now - while the process is still single-threaded
+    propagate_satloc_chunked(pool, datetime.utcnow())
+
+    # Release shared memory on exit if the pool is not closed explicitly
+    atexit.register(close_propagation_pool, pool)
+
+    return pool
+
+def close_propagation_pool(pool):
+    '''
+    Shut down worker processes and release shared memory (no-op if already closed).
+
+    @param pool: (dict) propagation pool
+    '''
+    if pool['out'] is None:
+        return
+    pool['executor'].shutdown(wait=True, cancel_futures=True)
+    pool['out'] = None
+    pool['shm'].close()
+    pool['shm'].unlink()
+
+def propagate_satloc_chunked(pool, time_in, re=_radius_earth__c):
+    '''
+    Propagate full catalogue at a single datetime across the process pool.
+
+    @param pool: (dict) propagation pool
+    @param time_in: (datetime) UTC datetime
+    @param re: (float) Earth radius
+    @return: N x 6 floating point array - contains x, y, z in ECI, and latitude, longitude and alitutde
+    '''
+    # Shared output buffer is reused - one propagation at a time
+    with pool['lock']:
+        futures = [pool['executor'].submit(_propagate_chunk, start, stop, time_in, re)
+                   for start, stop in pool['chunks']]
+        for f in futures:
+            f.result()
+        return pool['out'].copy()
+
+def propagate_catalogue(satrec_store, time_in, re=_radius_earth__c):
+    '''
+    Propagate full catalogue at a single datetime. The process-pool backend (satrec_store['propagation_pool']) is
+    used if attached and the catalogue is at least satrec_store['parallel_threshold'] satellites; otherwise the
+    store's prebuilt SatrecArray is propagated in the current process.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param time_in: (datetime) UTC datetime
+    @param re: (float) Earth radius
+    @return: N x 6 floating point array in satellite store order - x, y, z in ECI, latitude, longitude and altitude
+    '''
+    pool = satrec_store.get('propagation_pool')
+    if pool is not None and len(satrec_store['satrec']) >= satrec_store.get('parallel_threshold', 0):
+        return propagate_satloc_chunked(pool, time_in, re)
+    return compute_satloc(satrec_store['satrec_array'], time_in, re, False)
+
+def benchmark_propagation_backends(tle_in, sizes, n_workers=None, repeats=3):
+    '''
+    Time single-process and process-pool backends over catalogue sizes. Catalogues larger than tle_in are grown
+    synthetically by repeating TLEs. Pool start-up and TLE parsing are excluded (pools are persistent in the app).
+
+    @param tle_in: (array) N x 2 string array - contains TLE1 and TLE2 data in the respective columns
+    @param sizes: (list) catalogue sizes to benchmark
+    @param n_workers: (int) number of worker processes (optional - default number of CPUs)
+    @param repeats: (int) number of timed repeats per size (best time is reported)
+    @return: (DataFrame) best single-process and process-pool time (s) per size, and speed-up
+    '''
+    tle_in = np.asarray(tle_in, dtype=object)
+    time_in = datetime.utcnow()
+    results = []
+    for size in sizes:
+        tle_size = tle_in[np.arange(size) % tle_in.shape[0]]
+
+        satrec_array = SatrecArray([Satrec.twoline2rv(t[0], t[1]) for t in tle_size])
+        t_single = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            compute_satloc(satrec_array, time_in, _radius_earth__c, False)
+            t_single.append(time.perf_counter() - t0)
+
+        pool = create_propagation_pool(tle_size, n_workers)
+        try:
+            t_pool = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                propagate_satloc_chunked(pool, time_in)
+                t_pool.append(time.perf_counter() - t0)
+        finally:
+            close_propagation_pool(pool)
+
+        results.append(dict(size=size, single_process=min(t_single), process_pool=min(t_pool)))
+
+    results = pd.DataFrame(results)
+    results["speed_up"] = results["single_process"] / results["process_pool"]
+
+    return results
+
+
+if __name__ == "__main__":
+    from app.config.user_setup_app import satcat_loc
+    satcat = pd.read_csv(satcat_loc)
+    benchmark = benchmark_propagation_backends(satcat[["TLE1", "TLE2"]].values,
+                                               [1000, 10000, 25000, 50000, 100000, 200000])
+    print(benchmark.to_string(index=False))
+    crossover = benchmark[benchmark["speed_up"] > 1]
+    print("Crossover size: ", crossover["size"].min() if len(crossover) > 0 else "none (single process faster)")
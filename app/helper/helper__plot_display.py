@@ -8,6 +8,9 @@ Example:
 
 Function:
     filter_df:
+    create_3d_figure_patch: Create partial update of 3D figure (Earth surface and layout stay on the client)
+    create_2d_figure_patch: Create partial update of 2D figure (moves current position marker, extends ground track)
+    benchmark_3d_hover_modes: Compare 3D figure JSON size and serialisation time of hover modes
 Todo:
     *
 
@@ -37,17 +40,23 @@ Todo:
 
 ## Imports
 # Standard libraries
+import gzip
+import time
 import numpy as np
+import pandas as pd
 import plotly.graph_objs as go
+from dash import Patch
 from datetime import datetime
 import sys
 
 # Internal scripts
 sys.path.append("../../")
 from app.helper.helper__constants import (_radius_earth__c, _len_3d_viz_axis__c)
-from app.helper.helper__satellite_position import (compute_satloc, lla_to_xyz, sphere)
+from app.helper.helper__satellite_position import (sphere)
 from app.helper.helper__app_data import generate_orbital_path
-from app.styles.styles_sat_visualisations import (colorscale, colours, colorscale_marker, colorscale_markerpath)
+from app.helper.helper__orbit_path_cache import get_orbit_path
+from app.styles.styles_sat_visualisations import (colorscale, colours, colorscale_marker, colorscale_markerpath,
+                                                  hoverlabel_3d, hovertext_3d)
 
 # Generic functions
 def hover_activity_colours(status):
@@ -94,104 +103,118 @@ def create_3d_surface(img):
                       hoverinfo="none")            
     return surf_3d
 
-def create_3d_scatter_hover_label(dff, is_tracked = False):
+def create_3d_hover_text_index(df_in):
     """
-    Generate hover configuration for satellite markers.
+    Format static satellite metadata of 3D hover labels once per catalogue row, so that only positions are
+    formatted on refresh.
 
-    @param dff: DataFrame with satellite data
-    @param is_tracked: Boolean indicating if this is a tracked satellite with orbital path
+    @param df_in: (DataFrame) Satellite catalogue dataframe
 
-    @return: Dictionary with hoverlabel, hoverinfo, and hovertext keys
+    @return: (dict) Hover text index - formatted metadata (orbit path hover text) and details per catalogue row
     """
-    hover_texts = []
+    hover_columns = ["ObjectName", "SatCatId", "Status", "OrbitClass", "LaunchYear", "Owner"]
+    sat_rows = zip(*[np.asarray(df_in[col].values).tolist() for col in hover_columns])
 
-    hover_label = dict(
-        namelength=0,
-        font_family="Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif",
-        font_size=12,
-        font_color="white",
-        bgcolor="rgba(13, 15, 18, 0.95)",
-        bordercolor="#0dcaf0",
-        align="left"
-    )
+    metadata_texts, details_texts = [], []
+    for name, satcatid, status, orbit, launch_year, owner in sat_rows:
+        metadata_texts.append(hovertext_3d["metadata"].format(ObjectName=name,
+                                                              SatCatId=satcatid,
+                                                              status_color=hover_activity_colours(status),
+                                                              Status=status,
+                                                              OrbitClass=orbit))
+        details_texts.append(hovertext_3d["details"].format(LaunchYear=launch_year, Owner=owner))
 
-    hover_text_template = (
-        '<b style="font-size: 14px; background: linear-gradient(90deg, #00ff88 0%, #0dcaf0 100%); '
-        '-webkit-background-clip: text; -webkit-text-fill-color: transparent; '
-        'background-clip: text; color: #0dcaf0;">{ObjectName}</b><br>'
-        '<span style="color: rgba(173, 181, 189, 0.6);">━━━━━━━━━━━━━━━</span><br>'
-        '<b>ID:</b> <span style="color: rgba(255, 255, 255, 0.9);">{SatCatId}</span><br>'
-        '<b>Status:</b> <span style="color: {status_color};">●</span> '
-        '<span style="color: {status_color};">{Status}</span><br>'
-        '<b>Orbit:</b> <span style="color: rgba(255, 255, 255, 0.9);">{OrbitClass}</span><br>'
-        '<b>Launch:</b> <span style="color: rgba(255, 255, 255, 0.9);">{LaunchYear}</span><br>'
-        '<b>Owner:</b> <span style="color: rgba(255, 255, 255, 0.9);">{Owner}</span><br>'
-        '<span style="color: rgba(173, 181, 189, 0.6);">━━━━━━━━━━━━━━━</span><br>'
-        '<b>Position:</b><br>'
-        '<span style="color: rgba(108, 117, 125, 0.8); font-size: 11px;">  '
-        'Lat: {lat}° | Lon: {lon}° | Alt: {alt}km</span>'
-    )
+    return dict(metadata=np.array(metadata_texts, dtype=object), details=np.array(details_texts, dtype=object))
+
+def create_3d_scatter_hover_label(hover_text_index, row_index, sat_positions):
+    """
+    Generate hover configuration for satellite markers - cached metadata of each satellite followed by its position.
 
-    if is_tracked:
-        for idx, row in dff.iterrows():
-
-            status_colour = hover_activity_colours(row["Status"])
-            hover_text = hover_text_template.format(
-                            ObjectName=row["ObjectName"],
-                            SatCatId=row["SatCatId"],
-                            status_color=status_colour,
-                            Status=row["Status"],
-                            OrbitClass=row["OrbitClass"],
-                            LaunchYear=row["LaunchYear"],
-                            Owner=row["Owner"],
-                            lat=round(row["lat"], 2),
-                            lon=round(row["lon"], 2),
-                            alt=round(row["alt"])
-                        )
-            hover_texts.append(hover_text)
+    @param hover_text_index: Hover text index created by create_3d_hover_text_index
+    @param row_index: Catalogue row positions of satellites
+    @param sat_positions: Satellite positions aligned to row_index (columnar position store, or DataFrame with lat,
+        lon and alt columns)
 
-    else:
-        for idx, row in dff.iterrows():
-
-            status_colour = hover_activity_colours(row["Status"])
-            hover_text = hover_text_template.format(
-                ObjectName=row["ObjectName"],
-                SatCatId=row["SatCatId"],
-                status_color=status_colour,
-                Status=row["Status"],
-                OrbitClass=row["OrbitClass"],
-                LaunchYear=row["LaunchYear"],
-                Owner=row["Owner"],
-                lat=round(row["lat"], 2),
-                lon=round(row["lon"], 2),
-                alt=round(row["alt"])
-            )
-            hover_texts.append(hover_text)
+    @return: Dictionary with hoverlabel, hoverinfo, and hovertext keys
+    """
+    # Position fields - rounded in one pass per column
+    lat = np.round(np.asarray(sat_positions["lat"], dtype=np.float64), 2).tolist()
+    lon = np.round(np.asarray(sat_positions["lon"], dtype=np.float64), 2).tolist()
+    alt = np.rint(np.asarray(sat_positions["alt"], dtype=np.float64)).astype(np.int64).tolist()
+
+    position_template = hovertext_3d["position"]
+    hover_texts = [metadata + details + position_template.format(lat=lat_i, lon=lon_i, alt=alt_i)
+                   for metadata, details, lat_i, lon_i, alt_i in
+                   zip(hover_text_index['metadata'][row_index].tolist(), hover_text_index['details'][row_index].tolist(),
+                       lat, lon, alt)]
 
     return {
-        'hoverlabel': hover_label,
+        'hoverlabel': hoverlabel_3d,
         'hoverinfo': 'text',
         'hovertext': hover_texts
     }
 
-def create_3d_scatter_plot(dff, sat_status_encoded):
+def create_3d_scatter_hover_template(sat_columns, sat_positions, sat_status_encoded):
+    """
+    Generate compact hover configuration for satellite markers - per-point values in customdata, rendered on the
+    client by a single hovertemplate shared by all markers.
+
+    @param sat_columns: Satellite catalogue columns (dict of arrays from get_satellite_columns)
+    @param sat_positions: Columnar satellite positions aligned to sat_columns
+    @param sat_status_encoded: Encoded satellite status (1 - active, 0 - inactive) aligned to sat_columns
+
+    @return: Dictionary with hoverlabel, hovertemplate, and customdata keys
+    """
+    # Per-point values - catalogue metadata, status colour and rounded position
+    hover_columns = ["ObjectName", "SatCatId", "Status", "OrbitClass", "LaunchYear", "Owner"]
+    status_colours = np.where(np.asarray(sat_status_encoded) == 1, colours['markerpath1'], colours['markerpath0'])
+    customdata = np.empty((len(status_colours), len(hover_columns) + 4), dtype=object)
+    for i, col in enumerate(hover_columns):
+        customdata[:, i] = np.asarray(sat_columns[col])
+    customdata[:, 6] = status_colours
+    customdata[:, 7] = np.round(np.asarray(sat_positions["lat"], dtype=np.float64), 2)
+    customdata[:, 8] = np.round(np.asarray(sat_positions["lon"], dtype=np.float64), 2)
+    customdata[:, 9] = np.rint(np.asarray(sat_positions["alt"], dtype=np.float64)).astype(np.int64)
+
+    # Shared template - same layout as hover text, fields filled from customdata
+    fields = {col: "%{customdata[" + str(i) + "]}" for i, col in enumerate(hover_columns)}
+    hover_template = (hovertext_3d["metadata"].format(status_color="%{customdata[6]}", **fields) +
+                      hovertext_3d["details"].format(**fields) +
+                      hovertext_3d["position"].format(lat="%{customdata[7]}", lon="%{customdata[8]}",
+                                                      alt="%{customdata[9]}") +
+                      "<extra></extra>")
+
+    return {
+        'hoverlabel': hoverlabel_3d,
+        'hovertemplate': hover_template,
+        'customdata': customdata
+    }
+
+def create_3d_scatter_plot(sat_columns, sat_result, hover_text_index, hover_mode="text"):
     """
     Create 3D scatter plot of satellites.
 
-    @param dff: (DataFrame) Filtered satellite dataframe
-    @param sat_status_encoded: (array) Encoded satellite status array
+    @param sat_columns: (dict) Catalogue columns of filtered satellites (see get_satellite_columns)
+    @param sat_result: (dict) Filter result created by filter_satellite_data
+    @param hover_text_index: (dict) Hover text index created by create_3d_hover_text_index
+    @param hover_mode: (str) "text" - HTML hover text per marker, or "template" - customdata per marker with shared
+        hovertemplate (smaller figure)
 
     @return: (Scatter3d) Plotly Scatter3d object with satellite markers
     """
+    sat_positions = sat_result['positions']
+    sat_status_encoded = sat_result['status_encoded']
 
     # Generate hover configuration
-    hover_config = create_3d_scatter_hover_label(dff, is_tracked=False)
+    if hover_mode == "template":
+        hover_config = create_3d_scatter_hover_template(sat_columns, sat_positions, sat_status_encoded)
+    else:
+        hover_config = create_3d_scatter_hover_label(hover_text_index, sat_result['index'], sat_positions)
 
     # Create 3D scatter plot
-    scatter_3d = go.Scatter3d(x=dff["xp"].astype(np.float32), y=dff["yp"].astype(np.float32),
-                                z=dff["zp"].astype(np.float32),
-                                text=dff["ObjectName"], mode="markers", showlegend=False,
-                                marker=dict(color=np.where(dff["Status"] == "Active", 1, 0), cmin=0, cmax=1,
+    scatter_3d = go.Scatter3d(x=sat_positions["xp"], y=sat_positions["yp"], z=sat_positions["zp"],
+                                text=sat_columns["ObjectName"], mode="markers", showlegend=False,
+                                marker=dict(color=sat_status_encoded, cmin=0, cmax=1,
                                             colorscale=colorscale_marker, opacity=0.65, size=2.5,
                                             line=dict(color=sat_status_encoded,
                                                     colorscale=colorscale_marker, width=0.01,
@@ -219,37 +242,45 @@ def create_3d_figure(layout_3d, surf_3d, scatter_3d=None):
 
     return fig_3d
 
-def annotate_3d_figure(fig_3d, dff, time_now):
+def create_3d_annotation(sat_result, status_breakdown=None):
     """
-    Add annotations to 3D figure.
+    Create annotation of 3D figure - position time and number of active/inactive satellites.
 
-    @param fig_3d: (Figure) Current 3D figure
-    @param dff: (DataFrame) Filtered satellite dataframe
-    @param time_now: (datetime) Current timestamp
+    @param sat_result: (dict) Filter result created by filter_satellite_data
+    @param status_breakdown: (DataFrame) Satellites matching filter per status, from create_filter_breakdown
+        (optional - counted from sat_result if None)
 
-    @return: (Figure) Updated 3D figure with annotations
+    @return: (dict) Plotly annotation
     """
-    fig_3d.add_annotation(dict(font=dict(color=colours["atext"], size=10),
-                                x=0.005, y=0.99, showarrow=False,
-                                text=
-                                '<i><span style="font-size: clamp(8px, 2vw, 12px);">Satellite position as at: ' +
-                                time_now.strftime("%H:%M:%S, %d/%m/%Y") + '</span></i> <br>' +
-                                '<i><span style="font-size: clamp(8px, 2vw, 12px);">Number of active/inactive satellites shown: ' +
-                                "/".join(
-                                    [str(sum(dff.Status == "Active")), str(sum(dff.Status == "Inactive"))]) +
-                                ' (' + str(dff.shape[0]) + ' in total)' + '</span></i>',
-                                textangle=0, xanchor='left', align='left',
-                                xref="paper", yref="paper"))
-    return fig_3d
-
-def update_3d_camera_view(cam_mem, cam_scene, fig_3d):
+    time_now = sat_result['time']
+    if status_breakdown is not None:
+        status_counts = dict(zip(status_breakdown["Status"], status_breakdown["Count"]))
+        n_active, n_inactive = int(status_counts.get("Active", 0)), int(status_counts.get("Inactive", 0))
+    else:
+        n_active = int(np.sum(sat_result['status_encoded']))
+        n_inactive = len(sat_result['status_encoded']) - n_active
+
+    return dict(font=dict(color=colours["atext"], size=10),
+                x=0.005, y=0.99, showarrow=False,
+                text=
+                '<i><span style="font-size: clamp(8px, 2vw, 12px);">Satellite position as at: ' +
+                time_now.strftime("%H:%M:%S, %d/%m/%Y") + '</span></i> <br>' +
+                '<i><span style="font-size: clamp(8px, 2vw, 12px);">Number of active/inactive satellites selected: ' +
+                "/".join(
+                    [str(n_active), str(n_inactive)]) +
+                ' (' + str(n_active + n_inactive) + ' in total)' + '</span></i>',
+                textangle=0, xanchor='left', align='left',
+                xref="paper", yref="paper")
+
+def get_3d_camera_view(cam_mem, cam_scene, default_camera):
     """
-    Update 3D camera view based on user interactions.
+    Get 3D camera view based on user interactions.
 
     @param cam_mem: (dict) Camera memory from dcc.Store
     @param cam_scene: (dict) Camera scene from relayoutData
-    @param fig_3d: (Figure) Current 3D figure
+    @param default_camera: (dict) Camera of base 3D figure
 
+    @return: (dict) Camera view
     @return: (dict) Updated camera memory
     """
     try:
@@ -258,24 +289,47 @@ def update_3d_camera_view(cam_mem, cam_scene, fig_3d):
         try:
             cam_mem["scene.camera"]
         except:
-            fig_3d.update_layout(scene_camera=fig_3d["layout"]["scene"]["camera"])
+            camera = default_camera
         else:
-            fig_3d.update_layout(scene_camera=cam_mem["scene.camera"])
+            camera = cam_mem["scene.camera"]
     else:
-        fig_3d.update_layout(scene_camera=cam_scene["scene.camera"])
+        camera = cam_scene["scene.camera"]
         cam_mem = cam_scene["scene.camera"]
 
-    return fig_3d, cam_mem
+    return camera, cam_mem
+
+def create_3d_figure_patch(scatter_3d, orbit_traces, annotation, camera, trace_count):
+    """
+    Create partial update of 3D figure - satellite markers, orbit paths, annotation and camera are replaced while the
+    Earth surface (first trace) and the rest of the layout stay on the client.
+
+    @param scatter_3d: (Scatter3d) 3D scatter plot of satellites
+    @param orbit_traces: (list) Orbit path traces (see create_3d_orbit_path_traces)
+    @param annotation: (dict) Annotation (see create_3d_annotation)
+    @param camera: (dict) Camera view (see get_3d_camera_view)
+    @param trace_count: (int) Number of traces of 3D figure on the client before update
+
+    @return: (Patch) Dash patch of 3D figure
+    @return: (int) Number of traces of 3D figure on the client after update
+    """
+    fig_patch = Patch()
+    for _ in range(trace_count - 1):
+        del fig_patch['data'][1]
+    fig_patch['data'].extend([scatter_3d] + orbit_traces)
+    fig_patch['layout']['annotations'] = [annotation]
+    fig_patch['layout']['scene']['camera'] = camera
+
+    return fig_patch, 1 + 1 + len(orbit_traces)
 
 # Orbit path functions
-def handle_orbit_click(callback_context, click_data, orbit_list, dff):
+def handle_orbit_click(callback_context, click_data, orbit_list, sat_catid):
     """
     Handle orbit click events and update orbit list.
 
     @param callback_context: Dash callback context
     @param click_data: (dict) Click data from 3D plot
     @param orbit_list: (list) Current list of orbit IDs
-    @param dff: (DataFrame) Filtered satellite dataframe
+    @param sat_catid: (array) SATCAT numbers of filtered satellites, in 3D scatter point order
 
     @return: (list) Updated list of orbit IDs
     """
@@ -301,108 +355,96 @@ def handle_orbit_click(callback_context, click_data, orbit_list, dff):
     # Do not update if existing 3d orbit is clicked
     if input_type == "clickData":
         if click_data["points"][0]["curveNumber"] == 1:
-            orbit_id = dff.iloc[[click_data["points"][0]["pointNumber"]]]["SatCatId"].values[0]
+            orbit_id = int(sat_catid[click_data["points"][0]["pointNumber"]])
             if orbit_id in orbit_list_updated:
                 raise PreventUpdate            
 
     # Update orbit list with new orbit if valid click
     if input_type == "clickData":
         if click_data["points"][0]["curveNumber"] == 1:
-            orbit_list_updated.append(dff.iloc[[click_data["points"][0]["pointNumber"]]]["SatCatId"].values[0])
+            orbit_list_updated.append(int(sat_catid[click_data["points"][0]["pointNumber"]]))
             orbit_list_updated = list(set(orbit_list_updated))    
 
     return orbit_list_updated
 
-def create_3d_orbit_hover_label(dff):
+def create_3d_orbit_hover_label(hover_text_index, row, n_points, hover_mode="text"):
     """
-    Generate hover configuration for satellite orbit paths.
+    Generate hover configuration for satellite orbit paths - the satellite's cached metadata at every path point.
 
-    @param dff: DataFrame with satellite data
+    @param hover_text_index: Hover text index created by create_3d_hover_text_index
+    @param row: Catalogue row position of satellite
+    @param n_points: Number of orbit path points
+    @param hover_mode: "text" - hover text per path point, or "template" - metadata sent once as hovertemplate
 
-    @return: Dictionary with hoverlabel, hoverinfo, and hovertext keys
+    @return: Dictionary with hoverlabel and hovertext (text mode) or hovertemplate (template mode) keys
     """
+    if hover_mode == "template":
+        return {
+            'hoverlabel': hoverlabel_3d,
+            'hovertemplate': hover_text_index['metadata'][row] + "<extra></extra>"
+        }
 
-    # Define hover label style
-    hover_label = dict(
-        namelength=0,
-        font_family="Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif",
-        font_size=12,
-        font_color="white",
-        bgcolor="rgba(13, 15, 18, 0.95)",
-        bordercolor="#0dcaf0",
-        align="left"
-    )
-
-    # Define hover text template
-    hover_text_template = (
-        '<b style="font-size: 14px; background: linear-gradient(90deg, #00ff88 0%, #0dcaf0 100%); '
-        '-webkit-background-clip: text; -webkit-text-fill-color: transparent; '
-        'background-clip: text; color: #0dcaf0;">{ObjectName}</b><br>'
-        '<span style="color: rgba(173, 181, 189, 0.6);">━━━━━━━━━━━━━━━</span><br>'
-        '<b>ID:</b> <span style="color: rgba(255, 255, 255, 0.9);">{SatCatId}</span><br>'
-        '<b>Status:</b> <span style="color: {status_color};">●</span> '
-        '<span style="color: {status_color};">{Status}</span><br>'
-        '<b>Orbit:</b> <span style="color: rgba(255, 255, 255, 0.9);">{OrbitClass}</span><br>'
-    )
-
-    # Generate hover texts
-    hover_texts = []
-    for idx, row in dff.iterrows():
-
-        status_colour = hover_activity_colours(row["Status"])
-        hover_text = hover_text_template.format(
-            ObjectName=row["ObjectName"],
-            SatCatId=row["SatCatId"],
-            status_color=status_colour,
-            Status=row["Status"],
-            OrbitClass=row["OrbitClass"],
-            LaunchYear=row["LaunchYear"],
-            Owner=row["Owner"]
-        )
-        hover_texts.append(hover_text)  
-    
     return {
-        'hoverlabel': hover_label,
+        'hoverlabel': hoverlabel_3d,
         'hoverinfo': 'text',
-        'hovertext': hover_texts
-    }    
+        'hovertext': [hover_text_index['metadata'][row]] * n_points
+    }
 
-def add_orbit_paths_to_figure(fig_3d, dff, orbit_list, time_now):
+def create_3d_orbit_path_traces(df_in, sat_result, sat_catid, orbit_list, hover_text_index, satrec_store=None,
+                                hover_mode="text", orbit_path_cache=None):
     """
-    Add orbit paths to 3D figure.
-    @param fig_3d: (Figure) Current 3D figure
-    @param dff: (DataFrame) Filtered satellite dataframe
+    Create orbit path traces - orbit line and oversized current position marker per tracked satellite. Orbit lines
+    are served from the inertial orbit path cache (only the current Earth rotation is applied on refresh) and the
+    marker is placed at the satellite's current position from the filter result.
+    @param df_in: (DataFrame) Satellite catalogue dataframe
+    @param sat_result: (dict) Filter result created by filter_satellite_data
+    @param sat_catid: (array) SATCAT numbers of filtered satellites (aligned to sat_result['index'])
     @param orbit_list: (list) List of orbit IDs to add paths for
-    @param time_now: (datetime) Current timestamp
-    @return: (Figure) Updated 3D figure with orbit paths
+    @param hover_text_index: (dict) Hover text index created by create_3d_hover_text_index
+    @param satrec_store: (dict) Parsed satellite store (optional - paths are propagated from the catalogue's TLE
+        columns with generate_orbital_path if None)
+    @param hover_mode: (str) Orbit path hover mode - "text" or "template" (see create_3d_orbit_hover_label)
+    @param orbit_path_cache: (dict) Orbit path cache created by create_orbit_path_cache (optional)
+    @return: (list) Scatter3d orbit path traces
     """
+    sat_positions = sat_result['positions']
 
+    orbit_traces = []
     for orbit_id in orbit_list:
-        if orbit_id in dff["SatCatId"].values:
-            d3d = generate_orbital_path(dff[dff["SatCatId"] == orbit_id],
-                                720, time_now, True)
+        sat_pos = np.flatnonzero(sat_catid == orbit_id)
+        if len(sat_pos) > 0:
+            row = sat_result['index'][sat_pos[0]]
+            if satrec_store is not None:
+                path_3d = get_orbit_path(orbit_path_cache, satrec_store, orbit_id,
+                                         float(df_in["OrbitalPeriod"].values[row]), 720, sat_result['time'])
+            else:
+                path_3d = generate_orbital_path(df_in.iloc[[row]], 720, sat_result['time'],
+                                                True)[["xp", "yp", "zp"]].values
+            current_position = {col: sat_positions[col][sat_pos[:1]] for col in ["lat", "lon", "alt", "xp", "yp", "zp"]}
+            sat_status_enc = int(sat_result['status_encoded'][sat_pos[0]])
+
             # Get hover configuration
-            hover_config = create_3d_scatter_hover_label(d3d.iloc[[0]], is_tracked=True)
+            hover_config = create_3d_scatter_hover_label(hover_text_index, [row], current_position)
             # Get hover orbit configuration
-            hover_orbit_config = create_3d_orbit_hover_label(d3d)
+            hover_orbit_config = create_3d_orbit_hover_label(hover_text_index, row, path_3d.shape[0], hover_mode)
 
-            sat_path_status_enc = np.where(d3d["Status"] == "Active", 1, 0)[0]
-            # Update 3d plot with satellite orbital path
-            fig_3d.add_scatter3d(x=d3d["xp"], y=d3d["yp"], z=d3d["zp"],
-                                    line=dict(color=np.where(d3d["Status"] == "Active", 1, 0), cmin=0, cmax=1,
+            # Satellite orbital path
+            orbit_traces.append(go.Scatter3d(x=path_3d[:, 0], y=path_3d[:, 1], z=path_3d[:, 2],
+                                    line=dict(color=np.full(path_3d.shape[0], sat_status_enc), cmin=0, cmax=1,
                                             colorscale=colorscale_markerpath, width=5),
                                     mode="lines", showlegend=False,
-                                    **hover_orbit_config)
-            # Add oversized plot point for current position in orbital path
-            fig_3d.add_scatter3d(x=[d3d["xp"][0]], y=[d3d["yp"][0]], z=[d3d["zp"][0]],
-                                    marker=dict(color=np.where(d3d["Status"] == "Active", 1, 0),
+                                    **hover_orbit_config))
+            # Oversized plot point for current position in orbital path
+            orbit_traces.append(go.Scatter3d(x=current_position["xp"], y=current_position["yp"],
+                                    z=current_position["zp"],
+                                    marker=dict(color=[sat_status_enc],
                                                 colorscale=colorscale_markerpath,
                                                 cmin=0, cmax=1, opacity=0.65, size=8),
                                     mode="markers", showlegend=False,
                                     **hover_config
-                                    )
+                                    ))
 
-    return fig_3d
+    return orbit_traces
 
 def create_2d_layout():
     """
@@ -448,39 +490,63 @@ def create_2d_scatter_hover_label(dff):
     
     return hover_label
 
-def create_2d_scatter_plot(dff, time_now):
-    """
-    Create 2D scatter plot of satellites.
-    @param dff: (DataFrame) Filtered satellite dataframe
-    @param colours: (dict) Colour definitions
-    @param time_now: (datetime) Current timestamp
-    @return: (Figure) Plotly Figure object with 2D scatter plot
-    """
-
-    # Create 2D scatter plot
-    if dff.shape[0] == 1:
-        d2d = generate_orbital_path(dff, 3600, time_now, False)
-
-        # Generate hover labels
-        hover_labels = create_2d_scatter_hover_label(d2d)
-
-        scatter_2d_orbit_path = go.Scattermapbox(lat=d2d["lat"], lon=d2d["lon"],
-                                        marker=dict(color=colours["marker1"], opacity=0.1, size=10),
-                                        mode="markers", showlegend=False,
-                                        hoverlabel=dict(namelength=0), hoverinfo="text",
-                                        hovertext=hover_labels[0]
-                                        )
-        scatter_2d_current_position = go.Scattermapbox(lat=[d2d["lat"][0]], lon=[d2d["lon"][0]],
-                                        marker=dict(color=colours["marker2"], opacity=0.6, size=20),
-                                        mode="markers", showlegend=False,
-                                        hoverlabel=dict(namelength=0), hoverinfo="text",
-                                        hovertext='<b>Current Position</b>' + '<br>' +
-                                                    hover_labels[0][0]
-                                        )
-        return [scatter_2d_current_position, scatter_2d_orbit_path]
+def create_2d_current_position_trace(sat_result):
+    """
+    Create 2D marker of satellite's current position.
+    @param sat_result: (dict) Filter result created by filter_satellite_data (single satellite)
+    @return: (Scattermapbox) Current position marker
+    """
+    sat_positions = sat_result['positions']
+    current_position = pd.DataFrame({"lat": sat_positions["lat"][:1].astype(np.float64),
+                                     "lon": sat_positions["lon"][:1].astype(np.float64),
+                                     "alt": sat_positions["alt"][:1].astype(np.float64),
+                                     "Datetime": [np.datetime64(sat_result['time'], "s")]})
+
+    return go.Scattermapbox(lat=current_position["lat"], lon=current_position["lon"],
+                            marker=dict(color=colours["marker2"], opacity=0.6, size=20),
+                            mode="markers", showlegend=False,
+                            hoverlabel=dict(namelength=0), hoverinfo="text",
+                            hovertext='<b>Current Position</b>' + '<br>' +
+                                        create_2d_scatter_hover_label(current_position)[0]
+                            )
+
+def create_2d_ground_track_hover_label(ground_track):
+    """
+    Generate hover labels of 2D ground track samples.
+    @param ground_track: (dict) Ground track samples - 'time' (datetime64), 'lat', 'lon' and 'alt'
+    @return: (list) hover label per sample
+    """
+    d2d = pd.DataFrame({"lat": ground_track["lat"], "lon": ground_track["lon"], "alt": ground_track["alt"],
+                        "Datetime": np.asarray(ground_track["time"]).astype("datetime64[s]")})
+
+    return create_2d_scatter_hover_label(d2d)[0].tolist()
 
-    else:
-        return []
+def create_2d_ground_track_trace(ground_track):
+    """
+    Create 2D ground track of satellite.
+    @param ground_track: (dict) Ground track samples - 'time' (datetime64), 'lat', 'lon' and 'alt'
+    @return: (Scattermapbox) Ground track markers
+    """
+    return go.Scattermapbox(lat=ground_track["lat"], lon=ground_track["lon"],
+                            marker=dict(color=colours["marker1"], opacity=0.1, size=10),
+                            mode="markers", showlegend=False,
+                            hoverlabel=dict(namelength=0), hoverinfo="text",
+                            hovertext=create_2d_ground_track_hover_label(ground_track)
+                            )
+
+def create_2d_empty_plot():
+    """
+    Create invisible 2D scatter plot (shown when no single satellite is selected).
+    @return: (Scattermapbox) Invisible marker
+    """
+    return go.Scattermapbox(
+            lat=[0], lon=[0],
+            marker_opacity = 0,
+            mode = "markers",
+            showlegend = False,
+            hoverinfo='none',
+            hoverlabel=dict(namelength=0)    
+        )
 
 def create_2d_figure(layout_2d, scatter_plots=[]):
     """
@@ -492,16 +558,96 @@ def create_2d_figure(layout_2d, scatter_plots=[]):
     
     # Handle case with no scatter plots
     if len(scatter_plots) == 0:
-        fig_2d = go.Figure(data=go.Scattermapbox(
-            lat=[0], lon=[0],
-            marker_opacity = 0,
-            mode = "markers",
-            showlegend = False,
-            hoverinfo='none',
-            hoverlabel=dict(namelength=0)    
-        ),
-        layout=layout_2d)
+        fig_2d = go.Figure(data=create_2d_empty_plot(), layout=layout_2d)
     else:
         fig_2d = go.Figure(data=scatter_plots, layout=layout_2d)
 
     return fig_2d
+
+def create_2d_figure_patch(sat_result=None, ground_track=None):
+    """
+    Create partial update of 2D figure - the layout (map and view) stays on the client. The current position marker
+    is moved on every update; ground track samples are only sent when the client's track is extended or replaced,
+    and past samples are removed from its start (see get_ground_track_update).
+    @param sat_result: (dict) Filter result created by filter_satellite_data (single satellite, None - clear figure)
+    @param ground_track: (dict) Ground track samples to send (None - client's ground track is up to date)
+    @return: (Patch) Dash patch of 2D figure
+    """
+    fig_patch = Patch()
+    if sat_result is None:
+        fig_patch['data'] = [create_2d_empty_plot()]
+        return fig_patch
+
+    scatter_2d_current_position = create_2d_current_position_trace(sat_result)
+    if ground_track is not None and not ground_track['extend']:
+        fig_patch['data'] = [scatter_2d_current_position, create_2d_ground_track_trace(ground_track)]
+        return fig_patch
+
+    # Move current position marker
+    for prop in ["lat", "lon", "hovertext"]:
+        fig_patch['data'][0][prop] = scatter_2d_current_position[prop]
+
+    if ground_track is None:
+        return fig_patch
+
+    # Remove past samples from client's ground track
+    for _ in range(ground_track['drop']):
+        for prop in ["lat", "lon", "hovertext"]:
+            del fig_patch['data'][1][prop][0]
+
+    # Append new samples to client's ground track
+    if len(ground_track["lat"]) > 0:
+        fig_patch['data'][1]['lat'].extend(ground_track["lat"].tolist())
+        fig_patch['data'][1]['lon'].extend(ground_track["lon"].tolist())
+        fig_patch['data'][1]['hovertext'].extend(create_2d_ground_track_hover_label(ground_track))
+
+    return fig_patch
+
+def benchmark_3d_hover_modes(sat_columns, sat_result, hover_text_index, repeats=3):
+    """
+    Compare 3D satellite figure JSON size and serialisation time of hover modes ("text" and "template").
+    @param sat_columns: (dict) Catalogue columns of filtered satellites (see get_satellite_columns)
+    @param sat_result: (dict) Filter result created by filter_satellite_data
+    @param hover_text_index: (dict) Hover text index created by create_3d_hover_text_index
+    @param repeats: (int) number of timed repeats per mode (best time is reported)
+    @return: (DataFrame) number of markers, figure JSON size (raw and gzipped bytes), best build and serialisation
+        time (s) per hover mode
+    """
+    benchmark = []
+    for hover_mode in ["text", "template"]:
+        build_time, serialise_time = np.inf, np.inf
+        for _ in range(repeats):
+            t_start = time.perf_counter()
+            fig_3d = go.Figure(data=[create_3d_scatter_plot(sat_columns, sat_result, hover_text_index, hover_mode)])
+            t_build = time.perf_counter()
+            fig_json = fig_3d.to_json()
+            t_serialise = time.perf_counter()
+            build_time = min(build_time, t_build - t_start)
+            serialise_time = min(serialise_time, t_serialise - t_build)
+
+        benchmark.append(dict(hover_mode=hover_mode, markers=len(sat_result['index']), json_bytes=len(fig_json),
+                              gzip_bytes=len(gzip.compress(fig_json.encode())), build_s=build_time,
+                              serialise_s=serialise_time))
+
+    return pd.DataFrame(benchmark)
+
+if __name__ == "__main__":
+    from app.core.state import get_app_data, clear_app_data_cache
+    from app.helper.helper__app_data import filter_satellite_data, get_satellite_columns
+    from app.helper.helper__filter_query import create_default_filter_inputs
+
+    app_data = get_app_data()
+    df = app_data['data']['satcat_df']
+    options = app_data['filter']['options']
+    filter_inputs = create_default_filter_inputs(options)
+    for label, status, orbit in [("default filters", filter_inputs["status"], filter_inputs["orbit"]),
+                                 ("all satellites", ["Active", "Inactive"], options["orbit"])]:
+        sat_result = filter_satellite_data(df, app_data['filter']['initial_filter'],
+                                           **dict(filter_inputs, status=status, orbit=orbit),
+                                           position_cache=app_data['data']['position_cache'],
+                                           filter_index=app_data['filter']['filter_index'])
+        sat_columns = get_satellite_columns(df, sat_result, ["ObjectName", "SatCatId", "Status", "OrbitClass",
+                                                             "LaunchYear", "Owner"])
+        print(f"3D hover modes - {label}:")
+        print(benchmark_3d_hover_modes(sat_columns, sat_result, app_data['viz_3d']['hover_text_index']).to_string(index=False))
+    clear_app_data_cache()
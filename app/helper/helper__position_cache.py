@@ -0,0 +1,314 @@
+"""
+
+This module defines a process-wide cache of full-catalogue satellite position snapshots. Snapshots are keyed by an
+epoch quantised to a fixed resolution so that callbacks fired at nearly the same instant share one propagation.
+Optionally, a background producer thread propagates the full catalogue on a fixed cadence into two preallocated
+buffers so that callbacks only read the latest snapshot. The producer is started by the first snapshot request and
+stops itself once no snapshot has been requested for an idle timeout.
+
+Example:
+
+        $ python helper__position_cache.py
+
+Function:
+    quantise_epoch: Round datetime down to cache resolution
+    compute_position_snapshot: Propagate full catalogue and rotate into 3D scene coordinates
+    create_position_cache: Initialise position snapshot cache for satellite store
+    get_position_snapshot: Get full-catalogue satellite positions at quantised epoch
+    clear_position_cache: Remove all snapshots from cache
+    create_position_producer: Initialise double-buffered background position producer
+    start_position_producer: Start background position producer thread (if not running)
+    stop_position_producer: Stop background position producer thread
+    get_producer_snapshot: Get latest full-catalogue satellite positions from position producer
+    get_position_producer_stats: Get position producer monitoring statistics
+    select_position_columns: Gather satellites from snapshot into columnar position store
+Todo:
+    *
+
+"""
+
+## Imports
+# Standard libraries
+import numpy as np
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+# Internal modules
+from app.helper.helper__parallel_propagation import propagate_catalogue
+from app.helper.helper__satellite_position import teme_to_scene, compute_gmst, datetime64_to_jday
+from app.helper.helper__constants import _radius_earth__c, _position_columns__c
+
+_unix_epoch = datetime(1970, 1, 1)
+
+def quantise_epoch(time_in, resolution):
+    '''
+    Round datetime down to cache resolution.
+
+    @param time_in: (datetime) UTC datetime
+    @param resolution: (float) epoch resolution in seconds
+    @return: (datetime) quantised UTC datetime
+    '''
+    seconds = (time_in - _unix_epoch).total_seconds()
+    return _unix_epoch + timedelta(seconds=np.floor(seconds / resolution) * resolution)
+
+def compute_position_snapshot(satrec_store, epoch, out=None):
+    '''
+    Propagate full catalogue at epoch and rotate TEME positions into 3D scene coordinates.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param epoch: (datetime) UTC datetime
+    @param out: (array) 9 x N float32 array to write snapshot into (optional, e.g. preallocated buffer)
+    @return: 9 x N float32 array (one contiguous row per coordinate) in satellite store order - x, y, z in ECI,
+        latitude, longitude, altitude and x, y, z in 3D scene coordinates
+    '''
+    if out is None:
+        out = np.empty((9, len(satrec_store['satrec'])), dtype=np.float32)
+    positions = propagate_catalogue(satrec_store, epoch, _radius_earth__c)
+    out[:6] = positions.T
+    teme_to_scene(positions[:, :3], compute_gmst(*datetime64_to_jday(epoch)), out=out[6:9].T)
+
+    return out
+
+def create_position_cache(satrec_store, resolution, max_size, ttl):
+    '''
+    Initialise position snapshot cache for satellite store.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param resolution: (float) epoch resolution in seconds
+    @param max_size: (int) maximum number of snapshots held in cache
+    @param ttl: (float) time in seconds before a snapshot is evicted
+    @return: (dict) position snapshot cache
+    '''
+    position_cache = dict()
+    position_cache['satrec_store'] = satrec_store
+    position_cache['resolution'] = resolution
+    position_cache['max_size'] = max_size
+    position_cache['ttl'] = ttl
+    position_cache['snapshots'] = OrderedDict()
+    position_cache['lock'] = threading.Lock()
+
+    return position_cache
+
+def _evict_position_snapshots(position_cache, now):
+    '''
+    Evict expired snapshots and least recently used snapshots above maximum cache size.
+
+    @param position_cache: (dict) position snapshot cache
+    @param now: (float) current monotonic time
+    '''
+    snapshots = position_cache['snapshots']
+    for epoch in [k for k, v in snapshots.items() if now - v['created'] > position_cache['ttl']]:
+        del snapshots[epoch]
+    while len(snapshots) > position_cache['max_size']:
+        snapshots.popitem(last=False)
+
+def get_position_snapshot(position_cache, time_in, sat_index=None):
+    '''
+    Get full-catalogue satellite positions at quantised epoch. Positions are propagated once per epoch and shared
+    by all callers. If a position producer is attached to the cache (position_cache['producer']), it is started if
+    idle and its latest snapshot is returned instead, unless it has fallen more than three cadences behind.
+
+    @param position_cache: (dict) position snapshot cache
+    @param time_in: (datetime) UTC datetime
+    @param sat_index: (array) satellite store index of satellites to gather (optional - default all)
+    @return epoch: (datetime) quantised UTC datetime of snapshot
+    @return positions: 9 x N float32 array in satellite store order - x, y, z in ECI, latitude, longitude,
+        altitude and x, y, z in 3D scene coordinates (9 x n gathered satellites if sat_index is given)
+    '''
+    # Read latest snapshot from background producer if available
+    producer = position_cache.get('producer')
+    if producer is not None:
+        start_position_producer(producer)
+        epoch, positions = get_producer_snapshot(producer, sat_index)
+        if epoch is not None and (time_in - epoch).total_seconds() <= 3 * producer['cadence']:
+            return epoch, positions
+
+    epoch = quantise_epoch(time_in, position_cache['resolution'])
+
+    with position_cache['lock']:
+        now = time.monotonic()
+        _evict_position_snapshots(position_cache, now)
+
+        snapshots = position_cache['snapshots']
+        if epoch in snapshots:
+            snapshots.move_to_end(epoch)
+            positions = snapshots[epoch]['positions']
+        else:
+            # Propagate full catalogue at quantised epoch
+            positions = compute_position_snapshot(position_cache['satrec_store'], epoch)
+            positions.setflags(write=False)
+
+            snapshots[epoch] = dict(created=now, positions=positions)
+            _evict_position_snapshots(position_cache, now)
+
+    # Cached snapshots are read-only - gathered outside lock
+    if sat_index is not None:
+        positions = np.take(positions, sat_index, axis=1)
+
+    return epoch, positions
+
+def clear_position_cache(position_cache):
+    '''
+    Remove all snapshots from cache.
+
+    @param position_cache: (dict) position snapshot cache
+    '''
+    with position_cache['lock']:
+        position_cache['snapshots'].clear()
+
+def create_position_producer(satrec_store, cadence, resolution, idle_timeout):
+    '''
+    Initialise double-buffered background position producer. Two full-catalogue position buffers are preallocated;
+    the producer writes into the inactive buffer and swaps it in once propagation is complete.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param cadence: (float) time in seconds between propagation runs
+    @param resolution: (float) epoch resolution in seconds
+    @param idle_timeout: (float) time in seconds without snapshot requests before the producer thread stops
+    @return: (dict) position producer
+    '''
+    n_sat = len(satrec_store['satrec'])
+
+    producer = dict()
+    producer['satrec_store'] = satrec_store
+    producer['cadence'] = cadence
+    producer['resolution'] = resolution
+    producer['idle_timeout'] = idle_timeout
+    producer['last_request'] = time.monotonic()
+    producer['buffers'] = [np.full((9, n_sat), np.nan, dtype=np.float32),
+                           np.full((9, n_sat), np.nan, dtype=np.float32)]
+    producer['epochs'] = [None, None]
+    producer['active'] = 0
+    producer['lock'] = threading.Lock()
+    producer['stop_event'] = threading.Event()
+    producer['thread'] = None
+    producer['stats'] = dict(runs=0, last_run_duration=None, last_run_end=None, last_error=None)
+
+    return producer
+
+def _run_position_producer(producer):
+    '''
+    Background loop - propagate full catalogue into inactive buffer and swap buffers on a fixed cadence. The loop
+    exits once no snapshot has been requested for the idle timeout.
+
+    @param producer: (dict) position producer
+    '''
+    while not producer['stop_event'].is_set():
+        run_start = time.monotonic()
+        with producer['lock']:
+            if run_start - producer['last_request'] > producer['idle_timeout']:
+                producer['thread'] = None
+                return
+        try:
+            epoch = quantise_epoch(datetime.utcnow(), producer['resolution'])
+            inactive = 1 - producer['active']
+
+            # Propagate into inactive buffer
+            compute_position_snapshot(producer['satrec_store'], epoch, out=producer['buffers'][inactive])
+            producer['epochs'][inactive] = epoch
+
+            # Swap buffers
+            with producer['lock']:
+                producer['active'] = inactive
+            producer['stats']['last_error'] = None
+        except Exception as e:
+            producer['stats']['last_error'] = repr(e)
+
+        run_end = time.monotonic()
+        producer['stats']['runs'] += 1
+        producer['stats']['last_run_duration'] = run_end - run_start
+        producer['stats']['last_run_end'] = datetime.utcnow()
+
+        producer['stop_event'].wait(max(0., producer['cadence'] - (run_end - run_start)))
+
+def start_position_producer(producer):
+    '''
+    Start background position producer thread if not running (daemon thread - exits with the app process, or once
+    idle) and reset its idle timer.
+
+    @param producer: (dict) position producer
+    '''
+    with producer['lock']:
+        producer['last_request'] = time.monotonic()
+        if producer['thread'] is not None and producer['thread'].is_alive():
+            return
+        producer['stop_event'].clear()
+        producer['thread'] = threading.Thread(target=_run_position_producer, args=(producer,),
+                                              name="sattrack-position-producer", daemon=True)
+        producer['thread'].start()
+
+def stop_position_producer(producer, timeout=None):
+    '''
+    Stop background position producer thread.
+
+    @param producer: (dict) position producer
+    @param timeout: (float) time in seconds to wait for thread to finish (optional)
+    '''
+    producer['stop_event'].set()
+    thread = producer['thread']
+    if thread is not None:
+        thread.join(timeout)
+
+def get_producer_snapshot(producer, sat_index=None):
+    '''
+    Get latest full-catalogue satellite positions from position producer. Positions are copied out of the active
+    buffer while holding the producer lock - the buffer cannot be swapped out (and later overwritten) mid-copy.
+
+    @param producer: (dict) position producer
+    @param sat_index: (array) satellite store index of satellites to gather (optional - default all)
+    @return epoch: (datetime) UTC datetime of snapshot (None if no snapshot has been produced yet)
+    @return positions: 9 x N float32 array in satellite store order - x, y, z in ECI, latitude, longitude,
+        altitude and x, y, z in 3D scene coordinates (9 x n gathered satellites if sat_index is given)
+    '''
+    with producer['lock']:
+        active = producer['active']
+        if sat_index is None:
+            return producer['epochs'][active], producer['buffers'][active].copy()
+        return producer['epochs'][active], np.take(producer['buffers'][active], sat_index, axis=1)
+
+def get_position_producer_stats(producer):
+    '''
+    Get position producer monitoring statistics.
+
+    @param producer: (dict) position producer
+    @return: (dict) cadence (s), lag of latest snapshot behind current time (s), last run duration (s),
+        number of runs, thread status and last error
+    '''
+    with producer['lock']:
+        epoch = producer['epochs'][producer['active']]
+    stats = dict(producer['stats'])
+    stats['cadence'] = producer['cadence']
+    stats['lag'] = None if epoch is None else (datetime.utcnow() - epoch).total_seconds()
+    stats['epoch'] = epoch
+    stats['running'] = producer['thread'] is not None and producer['thread'].is_alive()
+
+    return stats
+
+def select_position_columns(positions, sat_index, row_index):
+    '''
+    Gather satellites from a full-catalogue snapshot into a columnar position store. All coordinates are held in
+    one 9 x n float32 block (a single gather from the snapshot), exposed as one contiguous array per coordinate.
+    Satellites without a valid position (failed propagation) are dropped from the store and its row index.
+
+    @param positions: (array) 9 x N float32 full-catalogue snapshot in satellite store order
+    @param sat_index: (array) satellite store index of each selected satellite (None - positions are already
+        gathered, e.g. by get_position_snapshot)
+    @param row_index: (array) row index of each selected satellite in the satellite catalogue dataframe
+    @return: (dict) columnar position store - 'index' (row index), 'columns' (9 x n float32 block) and one float32
+        array per coordinate: x, y, z in ECI, lat, lon, alt and xp, yp, zp in 3D scene coordinates
+    '''
+    columns = positions if sat_index is None else np.take(positions, sat_index, axis=1)
+
+    # Drop satellites with failed propagation
+    valid = np.isfinite(columns).all(axis=0)
+    if not valid.all():
+        columns = np.compress(valid, columns, axis=1)
+        row_index = row_index[valid]
+
+    sat_positions = dict(index=row_index, columns=columns)
+    for i, col in enumerate(_position_columns__c):
+        sat_positions[col] = columns[i]
+
+    return sat_positions
@@ -14,9 +14,17 @@ Example:
 
 Functions:
     - julianDateToGMST2: Converts Julian date to GMST (Greenwich Mean Sidereal Time 1982 )
+    - compute_gmst: GMST in radians, reusing previous results for single epochs
+    - datetime64_to_jday: Convert numpy datetime64 epochs to Julian date without Python-level iteration
     - longitude_trunc: Truncate longitude to range [-pi,+pi]
     - teme2geodetic_spherical: Convert ECI (Earth Centred Inertial) coordinates to Longitude, Latitude and Altitude
+    - create_satrec_store: Parse catalogue TLEs once into sgp4 satellite objects indexed by SATCAT number
+    - get_satrec_store_index: Look up store position of SATCAT numbers
+    - select_satrec_array: Select sgp4 satellite array for a subset of the catalogue without re-parsing TLEs
     - compute_satloc: Compute Geodetic position of satellite from TLE data and UTC datetime
+    - compute_satloc_path: Compute position of a single satellite at multiple epochs with one SGP4 call
+    - compute_satloc_grid: Compute position and velocity of N satellites at M epochs with one SGP4 call
+    - teme_to_scene: Rotate TEME coordinates straight into 3D visualisation scene coordinates
     - lla_to_xyz: Convert geodetic position to Cartesian coordinates
     - sphere: Compute surface of Earth as a sphere in Cartesian coordinates
 
@@ -24,7 +32,10 @@ Functions:
 
 import numpy as np
 from math import pi
-from sgp4.api import Satrec, SatrecArray, jday
+from functools import lru_cache
+from sgp4.api import Satrec, SatrecArray
+
+_jd_unix_epoch = 2440587.5 # Julian date of 1970-01-01 00:00 UTC
 
 def julianDateToGMST2(jd, fr):
     """
@@ -64,13 +75,49 @@ def julianDateToGMST2(jd, fr):
     return theta, theta_dot
 
 
+@lru_cache(maxsize=1024)
+def _gmst_scalar(jd, fr):
+    """ Cached GMST for a single epoch """
+    return julianDateToGMST2(jd, fr)[0]
+
+
+def compute_gmst(jd, fr):
+    """
+    GMST (Greenwich Mean Sidereal Time 1982) in radians. Single epochs are cached so that repeated
+    conversions at the same epoch (e.g. shared position snapshots) reuse the previous result.
+    Parameters:
+    jd : float or vector - Julian date full integer + 0.5
+    fr : float or vector - fractional part of the Julian date
+    """
+    if np.ndim(jd) == 0 and np.ndim(fr) == 0:
+        return _gmst_scalar(float(jd), float(fr))
+    return julianDateToGMST2(jd, fr)[0]
+
+
+def datetime64_to_jday(t):
+    """
+    Convert UTC numpy datetime64 epochs to Julian date (expressed as two floats) without Python-level iteration.
+    Sub-second precision is kept to the microsecond.
+    Parameters:
+    t : datetime64 or vector of datetime64 - UTC epochs. Datetime objects (or lists of) are converted to datetime64
+    Returns
+    =======
+    jd, fr : float or vector - Julian date full integer + 0.5 and fractional part, as returned by sgp4.api.jday
+    """
+    t = np.asarray(t, dtype="datetime64[us]")
+    day = t.astype("datetime64[D]")
+    jd = day.astype(np.int64) + _jd_unix_epoch
+    fr = (t - day).astype(np.int64) / 86400e6
+    return jd, fr
+
+
 def longitude_trunc(lon):
     """ Makes sure the longitude is within -2*pi ... 2*pi range """
     lon = lon - 2 * pi * np.sign(lon) * (abs(lon) > pi) ** 2
     return lon
 
 
-def teme2geodetic_spherical(x, y, z, t, re):
+def teme2geodetic_spherical(x, y, z, t, re, gmst=None):
     """
     Converts ECI coords (x,y,z - expressed in km) to LLA (longitude, lattitude, altitude).
     This function assumes the Earth is completely round.
@@ -80,21 +127,16 @@ def teme2geodetic_spherical(x, y, z, t, re):
     ==========
     x,y,z : floating point or vector - coordates in TEME (True Equator Mean Equinoex) version of ECI (Earth Centered Intertial) coords system.
             This is the system that's produced by SGP4 models.
-    t : datetime object or vector of datetime objects in UTC timezone. If vector, must be same length as x,y,z
+    t : datetime object or vector of datetime objects (or datetime64) in UTC timezone. If vector, must be same length as x,y,z
     re : floating point - Earth radius.
+    gmst : floating point or vector (optional) - precomputed GMST in radians. If given, t is ignored.
     """
 
-    if isinstance(t, (np.ndarray, list)):
-        if len(x) != len(t) or len(x) != len(t) or len(x) != len(t):
+    if gmst is None:
+        if np.ndim(t) > 0 and len(x) != len(t):
             print("If t is a vector, must be the same shape as x,y,z")
             return
-        dt_array = np.array([(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second) for dt in t])
-        jd, fr = jday(dt_array[:, 0], dt_array[:, 1], dt_array[:, 2],
-                      dt_array[:, 3], dt_array[:, 4], dt_array[:, 5])
-    else:
-        jd, fr = jday(t.year, t.month, t.day, t.hour, t.minute, t.second)
-
-    gmst = julianDateToGMST2(jd, fr)[0]
+        gmst = compute_gmst(*datetime64_to_jday(t))
 
     lat = np.arctan2(z, np.sqrt(x * x + y * y))  # phi
     lon = np.arctan2(y, x) - gmst  # lambda-E
@@ -104,54 +146,222 @@ def teme2geodetic_spherical(x, y, z, t, re):
     return lat * 180 / np.pi, lon * 180 / np.pi, alt
 
 
+def create_satrec_store(satcat_id, tle_in):
+    '''
+    Parse catalogue TLEs once into sgp4 satellite objects. The store is indexed by SATCAT number so that filtered
+    subsets of the catalogue can be propagated without re-parsing TLE text.
+
+    @param satcat_id: (array) N x 1 integer array of SATCAT numbers
+    @param tle_in: (array) N x 2 string array - contains TLE1 and TLE2 data in the respective columns
+    @return: (dict) satellite store - list of Satrec objects, prebuilt SatrecArray of full catalogue and SATCAT index
+    '''
+    satcat_id = np.asarray(satcat_id)
+
+    # Parse TLEs into sgp4 satellite objects
+    satrec_list = [Satrec.twoline2rv(t[0], t[1]) for t in tle_in]
+
+    # Sorted SATCAT numbers used to look up store position
+    satcat_order = np.argsort(satcat_id, kind="stable")
+
+    satrec_store = dict()
+    satrec_store['satrec'] = satrec_list
+    satrec_store['satrec_array'] = SatrecArray(satrec_list)
+    satrec_store['satcat_id'] = satcat_id
+    satrec_store['satcat_order'] = satcat_order
+    satrec_store['satcat_sorted'] = satcat_id[satcat_order]
+
+    return satrec_store
+
+
+def get_satrec_store_index(satrec_store, satcat_id):
+    '''
+    Look up store position of SATCAT numbers.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param satcat_id: (array) M x 1 integer array of SATCAT numbers (must exist in store)
+    @return: (array) M x 1 integer array of store positions
+    '''
+    satcat_id = np.asarray(satcat_id)
+    return satrec_store['satcat_order'][np.searchsorted(satrec_store['satcat_sorted'], satcat_id)]
+
+
+def select_satrec_array(satrec_store, satcat_id):
+    '''
+    Select sgp4 satellite array for a subset of the catalogue without re-parsing TLEs.
+
+    @param satrec_store: (dict) satellite store created by create_satrec_store
+    @param satcat_id: (array) M x 1 integer array of SATCAT numbers to select (must exist in store)
+    @return: (SatrecArray) sgp4 satellite array in the same order as satcat_id
+    '''
+    n_store = len(satrec_store['satrec'])
+
+    # Look up store position of each SATCAT number
+    pos = get_satrec_store_index(satrec_store, satcat_id)
+
+    # Reuse prebuilt array if the full catalogue is selected in store order
+    if len(pos) == n_store and np.array_equal(pos, np.arange(n_store)):
+        return satrec_store['satrec_array']
+
+    return SatrecArray([satrec_store['satrec'][i] for i in pos])
+
+
 def compute_satloc(tle_in, time_in, re, eci):
     '''
     Compute satellite position from Two-Line Element (TLE) data. TLEs are passed through a Simplified General Perturbations (SGP4) propagator to calculate satellite position in the TEME version of the Earth Centred Coordinate System assuming a spherical Earth.
 
-    @param tle_in: (dataframe) N x 2 floating point array - contains TLE1 and TLE2 data in the respective columns
-    @param time_in: (datetime) UTC datetime as datetime object or list of datetime objects
+    @param tle_in: (dataframe) N x 2 floating point array - contains TLE1 and TLE2 data in the respective columns. A prebuilt SatrecArray may be passed instead (see select_satrec_array) when time_in is a single datetime
+    @param time_in: (datetime) UTC datetime as datetime object, datetime64, or list/array of datetime objects or datetime64
     @param re: (float) single floating point of Earth radius
     @param eci: (boolean) set True to compute geodetic position for fixed datetime
     @return: N x 6 floating point array - contains x, y, z in ECI, and latitude, longitude and alitutde
     '''
-    # Define time used to compute Geodetic position
-    time_in2 = time_in
+    multi_epoch = np.ndim(time_in) > 0
 
     # Calculate Julian date
-    if isinstance(time_in, (np.ndarray, list)):
-        if eci: time_in2 = time_in[0]
-        if tle_in.shape[0] > 2:
-            raise ValueError("Both TLE and datetime arguments cannot be arrays")
-        else:
-            dt_array = np.array([(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second) for dt in time_in])
-            jd, fr = jday(dt_array[:, 0], dt_array[:, 1], dt_array[:, 2],
-                          dt_array[:, 3], dt_array[:, 4], dt_array[:, 5])
-    else:
-        jd, fr = jday(time_in.year, time_in.month, time_in.day, time_in.hour, time_in.minute, time_in.second)
-        jd = np.reshape(np.array(jd), (1,))
-        fr = np.reshape(np.array(fr), (1,))
+    if multi_epoch and tle_in.shape[0] > 2:
+        raise ValueError("Both TLE and datetime arguments cannot be arrays")
+    jd, fr = datetime64_to_jday(time_in)
+    jd = np.reshape(jd, (-1,))
+    fr = np.reshape(fr, (-1,))
 
     # Compute TEME - xyz Satellite position
-    if isinstance(time_in, (np.ndarray, list)):
-        teme_p = []
-        for j, f in zip(jd, fr):
-            teme_p.append([Satrec.twoline2rv(tle_in[0], tle_in[1]).sgp4(j, f)[1]])
-        teme_p2 = np.array(teme_p)[:, 0]
+    if multi_epoch:
+        # Parse TLE once and propagate all epochs in a single call
+        _, teme_p2, _ = Satrec.twoline2rv(tle_in[0], tle_in[1]).sgp4_array(jd, fr)
     else:
-        # Create array of sqgp4 satellite objects
-        satellite_list = list()
-        for t in tle_in:
-            satellite_list.append(Satrec.twoline2rv(t[0], t[1]))
-        satellite_array = SatrecArray(satellite_list)
+        # Create array of sqgp4 satellite objects (skip TLE parsing if already parsed)
+        if isinstance(tle_in, SatrecArray):
+            satellite_array = tle_in
+        else:
+            satellite_list = list()
+            for t in tle_in:
+                satellite_list.append(Satrec.twoline2rv(t[0], t[1]))
+            satellite_array = SatrecArray(satellite_list)
         _, teme_p, _ = satellite_array.sgp4(jd, fr)
         teme_p2 = np.reshape(teme_p, (teme_p.shape[0], teme_p.shape[2]))
 
+    # Compute GMST - fixed at first epoch for ECI paths
+    if multi_epoch and not eci:
+        gmst = compute_gmst(jd, fr)
+    else:
+        gmst = compute_gmst(jd[0], fr[0])
+
     # Convert TEME to Geodetic - assume spherical Earth
-    lat, lon, alt = teme2geodetic_spherical(teme_p2[:, 0], teme_p2[:, 1], teme_p2[:, 2], time_in2, re)
+    lat, lon, alt = teme2geodetic_spherical(teme_p2[:, 0], teme_p2[:, 1], teme_p2[:, 2], None, re, gmst=gmst)
 
     return np.concatenate((teme_p2, np.vstack((lat, lon, alt)).T), axis=1)
 
 
+def compute_satloc_path(satrec, jd, fr, re, eci, teme_p=None):
+    '''
+    Compute position of a single satellite at multiple epochs. All epochs are propagated with a single SGP4 call.
+
+    @param satrec: (Satrec) parsed sgp4 satellite object
+    @param jd: (array) M x 1 floating point array of Julian dates (whole part) - or M x 1 datetime64 array of UTC epochs
+    @param fr: (array) M x 1 floating point array of Julian dates (fractional part) - None if jd is datetime64
+    @param re: (float) single floating point of Earth radius
+    @param eci: (boolean) set True to compute geodetic position for fixed datetime (first epoch)
+    @param teme_p: (array) M x 3 floating point array of precomputed TEME positions (optional) - skips SGP4
+    @return: M x 6 floating point array - contains x, y, z in ECI, and latitude, longitude and alitutde
+    '''
+    if fr is None:
+        jd, fr = datetime64_to_jday(jd)
+
+    # Compute TEME - xyz Satellite position
+    if teme_p is None:
+        _, teme_p, _ = satrec.sgp4_array(jd, fr)
+
+    # Compute GMST - fixed at first epoch for ECI paths
+    if eci:
+        gmst = compute_gmst(jd[0], fr[0])
+    else:
+        gmst = compute_gmst(jd, fr)
+
+    # Convert TEME to Geodetic - assume spherical Earth
+    lat, lon, alt = teme2geodetic_spherical(teme_p[:, 0], teme_p[:, 1], teme_p[:, 2], None, re, gmst=gmst)
+
+    return np.concatenate((teme_p, np.vstack((lat, lon, alt)).T), axis=1)
+
+
+def compute_satloc_grid(sat_in, jd, fr, re):
+    '''
+    Compute position and velocity of N satellites at M epochs. All satellites and epochs are propagated with a single
+    SGP4 call and returned as dense N x M arrays. Failed propagations (e.g. decayed orbits) are flagged by a non-zero
+    SGP4 error code and have NaN position, velocity and geodetic values.
+
+    @param sat_in: (SatrecArray) sgp4 satellite array (see select_satrec_array). A list of Satrec objects or an
+        N x 2 string array of TLE1 and TLE2 data may be passed instead
+    @param jd: (array) M x 1 floating point array of Julian dates (whole part) - or M x 1 datetime64 array of UTC epochs
+    @param fr: (array) M x 1 floating point array of Julian dates (fractional part) - None if jd is datetime64
+    @param re: (float) single floating point of Earth radius
+    @return r: N x M x 3 floating point array - x, y, z position in TEME (km)
+    @return v: N x M x 3 floating point array - x, y, z velocity in TEME (km/s)
+    @return lat: N x M floating point array - latitude (degrees)
+    @return lon: N x M floating point array - longitude (degrees)
+    @return alt: N x M floating point array - altitude (km)
+    @return e: N x M integer array - SGP4 error code (0 = success)
+    '''
+    # Create array of sgp4 satellite objects (skip TLE parsing if already parsed)
+    if isinstance(sat_in, SatrecArray):
+        satellite_array = sat_in
+    elif len(sat_in) > 0 and isinstance(sat_in[0], Satrec):
+        satellite_array = SatrecArray(list(sat_in))
+    else:
+        satellite_array = SatrecArray([Satrec.twoline2rv(t[0], t[1]) for t in sat_in])
+
+    if fr is None:
+        jd, fr = datetime64_to_jday(jd)
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    fr = np.atleast_1d(np.asarray(fr, dtype=np.float64))
+
+    # Compute TEME position and velocity - N x M x 3
+    e, r, v = satellite_array.sgp4(jd, fr)
+
+    # Mask failed propagations
+    failed = e != 0
+    r[failed] = np.nan
+    v[failed] = np.nan
+
+    # Convert TEME to Geodetic - GMST computed once per epoch and broadcast over satellites
+    gmst = compute_gmst(jd, fr)
+    lat, lon, alt = teme2geodetic_spherical(r[..., 0], r[..., 1], r[..., 2], None, re, gmst=gmst[np.newaxis, :])
+
+    return r, v, lat, lon, alt, e
+
+
+def teme_to_scene(teme, gmst, out=None):
+    '''
+    Rotate TEME coordinates straight into 3D visualisation scene coordinates. Equivalent to converting to latitude,
+    longitude and altitude (teme2geodetic_spherical) and back with lla_to_xyz - i.e. rotation about the z-axis by
+    GMST plus the +180 degree display offset - but applied as a single matrix multiply.
+
+    @param teme: (array) N x 3 floating point array of x, y, z positions in TEME
+    @param gmst: (float) GMST in radians - or N x 1 floating point array of GMST per row
+    @param out: (array) N x 3 floating point array to write scene coordinates into (optional, e.g. preallocated buffer)
+    @return: N x 3 floating point array of scene x, y, z positions
+    '''
+    teme = np.asarray(teme)
+    if out is None:
+        out = np.empty(teme.shape, dtype=np.result_type(teme.dtype, np.float32))
+
+    cos_g = np.cos(gmst)
+    sin_g = np.sin(gmst)
+
+    if np.ndim(gmst) == 0:
+        rotation = np.array([[-cos_g, -sin_g, 0.],
+                             [sin_g, -cos_g, 0.],
+                             [0., 0., 1.]])
+        np.matmul(teme, rotation.T, out=out)
+    else:
+        x = teme[:, 0]
+        y = teme[:, 1]
+        out[:, 2] = teme[:, 2]
+        out[:, 0] = -(x * cos_g + y * sin_g)
+        out[:, 1] = x * sin_g - y * cos_g
+
+    return out
+
+
 def lla_to_xyz(lat, lon, alt, re):
     '''
     Compute satellite position in Cartesian geometry (x,y,z) using Longitude, Latitude and Altitude
@@ -13,6 +13,14 @@ Todo:
 
 """
 
+## Imports
+# Standard libraries
+import numpy as np
+import pandas as pd
+
+# Internal modules
+from app.helper.helper__app_data import get_satellite_columns
+
 def create_table_mapping():
     '''
     Generate column name mapping for table export.
@@ -23,23 +31,27 @@ def create_table_mapping():
               "lat":"Latitude", "lon":"Longitude", "alt":"Altitude (km)", "Datetime":"Datetime (UTC)"}
     return tbl_mapping
 
-def format_table_data(dff, time_now):
+def format_table_data(df_in, sat_result):
     '''
     Format table data for display.
-    @param dff: (DataFrame) Filtered satellite dataframe
-    @param time_now: (datetime) Current timestamp
+    @param df_in: (DataFrame) Satellite catalogue dataframe (not copied - only table columns of filtered rows are read)
+    @param sat_result: (dict) Filter result created by filter_satellite_data
     @return: (tbl_display_output: dict) Formatted table data for display
     '''
     # Get table column mapping
     tbl_column_map = create_table_mapping()
+    sat_positions = sat_result['positions']
 
-    # Format data
-    dff["lat"] = round(dff["lat"], 2)
-    dff["lon"] = round(dff["lon"], 2)
-    dff["alt"] = round(dff["alt"]).astype(int)
-    dff["Datetime"] = time_now.strftime("%H:%M:%S, %d/%m/%Y")
+    # Format data - positions rounded in float64 so table shows clean decimals
+    tbl_display_df = pd.DataFrame(get_satellite_columns(df_in, sat_result,
+                                                        [col for col in tbl_column_map.keys() if col in df_in.columns]))
+    tbl_display_df = tbl_display_df.assign(
+        lat=np.round(sat_positions["lat"].astype(np.float64), 2),
+        lon=np.round(sat_positions["lon"].astype(np.float64), 2),
+        alt=np.round(sat_positions["alt"]).astype(int),
+        Datetime=sat_result['time'].strftime("%H:%M:%S, %d/%m/%Y"))
 
     # Generate table display output
-    tbl_display_output = dff[list(tbl_column_map.keys())].sort_values(by=["ObjectName"]).rename(columns=tbl_column_map).to_dict("records")
+    tbl_display_output = tbl_display_df[list(tbl_column_map.keys())].sort_values(by=["ObjectName"]).rename(columns=tbl_column_map).to_dict("records")
 
     return tbl_display_output
\ No newline at end of file
@@ -9,18 +9,23 @@ from app.layouts.components.filters.status_filter import create_status_filter
 from app.layouts.components.filters.orbit_filter import create_orbit_filter
 from app.layouts.components.filters.search_filter import create_search_filter
 from app.layouts.components.filters.advanced_filters import create_advanced_filters
+from app.helper.helper__filter_query import create_default_filter_inputs
 
 
-def create_filter_sidebar(options):
+def create_filter_sidebar(options, filter_inputs=None):
     """
     Create the complete filter sidebar with all filter components.
 
     Args:
         options (dict): Dictionary containing all filter options
+        filter_inputs (dict): Initial filter values, e.g. parsed from URL filter query (optional - sidebar defaults)
 
     Returns:
         dbc.Col: Filter sidebar column component
     """
+    if filter_inputs is None:
+        filter_inputs = create_default_filter_inputs(options)
+
     return dbc.Col([
         dbc.Card([
             dbc.CardHeader([
@@ -36,16 +41,16 @@ def create_filter_sidebar(options):
             dbc.Collapse([
                 dbc.CardBody([
                     # Status Filter
-                    create_status_filter(),
+                    create_status_filter(filter_inputs["status"]),
 
                     # Orbit Filter
-                    create_orbit_filter(options),
+                    create_orbit_filter(options, filter_inputs["orbit"]),
 
                     # Satellite Search
-                    create_search_filter(options),
+                    create_search_filter(options, filter_inputs["satname"], filter_inputs["satcatid"]),
 
                     # Advanced Filters (collapsible)
-                    create_advanced_filters(options),
+                    create_advanced_filters(options, filter_inputs),
 
                     # Action Buttons
                     dbc.ButtonGroup([
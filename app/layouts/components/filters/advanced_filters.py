@@ -7,23 +7,28 @@ import dash_bootstrap_components as dbc
 from app.helper.helper__filter_display import format_year_slider_output
 
 
-def create_advanced_filters(options):
+def create_advanced_filters(options, filter_inputs=None):
     """
     Create the advanced filters accordion component.
 
     Args:
         options (dict): Dictionary containing filter options
+        filter_inputs (dict): Initial owner, launchvehicle, purpose and year values (optional - none selected and
+            full launch year range)
 
     Returns:
         dbc.Accordion: Advanced filters component
     """
+    if filter_inputs is None:
+        filter_inputs = dict(owner=[], launchvehicle=[], purpose=[], year=options["launchyear"])
+
     return dbc.Accordion([
         dbc.AccordionItem([
             # Owner dropdown
             dcc.Dropdown(
                 options=options["owner"],
                 multi=True,
-                value=[],
+                value=filter_inputs["owner"],
                 placeholder="Select owners...",
                 id="owner-filter-multi-dropdown",
                 className="mb-3",
@@ -33,7 +38,7 @@ def create_advanced_filters(options):
             dcc.Dropdown(
                 options=options["launchvehicle"],
                 multi=True,
-                value=[],
+                value=filter_inputs["launchvehicle"],
                 placeholder="Select launch vehicles...",
                 id="launchvehicle-filter-multi-dropdown",
                 className="mb-3",
@@ -43,7 +48,7 @@ def create_advanced_filters(options):
             dcc.Dropdown(
                 options=options["purpose"],
                 multi=True,
-                value=[],
+                value=filter_inputs["purpose"],
                 placeholder="Select purposes...",
                 id="purpose-filter-multi-dropdown",
                 className="mb-4",
@@ -70,7 +75,7 @@ def create_advanced_filters(options):
                     min=1958,
                     max=2025,
                     step=1,
-                    value=options["launchyear"],
+                    value=filter_inputs["year"],
                     marks={},
                     id="launchyear-filter-slider",
                     tooltip={"placement": "top", "always_visible": False},
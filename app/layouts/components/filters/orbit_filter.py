@@ -6,12 +6,13 @@ from dash import dcc, html
 import dash_bootstrap_components as dbc
 
 
-def create_orbit_filter(options):
+def create_orbit_filter(options, value=None):
     """
     Create the orbit type filter component.
 
     Args:
         options (dict): Dictionary containing orbit options
+        value (list): Initially selected orbit types (default: LEO, GEO)
 
     Returns:
         html.Div: Orbit filter component
@@ -33,7 +34,7 @@ def create_orbit_filter(options):
         ], target="orbit-info-icon", placement="right"),
         dcc.Checklist(
             options=[{"label": " " + orbit, "value": orbit} for orbit in options["orbit"]],
-            value=["LEO", "GEO"],
+            value=["LEO", "GEO"] if value is None else value,
             id="orbit-filter-checkbox",
             className="mb-3",
             style={"display": "grid",
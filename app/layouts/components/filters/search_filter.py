@@ -5,12 +5,14 @@ Satellite search filter component (by name and SATCAT ID).
 from dash import dcc, html
 
 
-def create_search_filter(options):
+def create_search_filter(options, satname=None, satcatid=None):
     """
     Create the satellite search filter component.
 
     Args:
         options (dict): Dictionary containing satname and satcatid options
+        satname (str): Initially selected satellite name (optional)
+        satcatid (str): Initially selected SATCAT number (optional)
 
     Returns:
         html.Div: Search filter component
@@ -19,6 +21,7 @@ def create_search_filter(options):
         html.Label("Search Satellite", className="fw-bold small"),
         dcc.Dropdown(
             options=options["satname"],
+            value=satname,
             placeholder="Type to search...",
             id="satname-filter-dropdown",
             className="mb-2",
@@ -26,6 +29,7 @@ def create_search_filter(options):
         ),
         dcc.Dropdown(
             options=options["satcatid"],
+            value=satcatid,
             placeholder="SATCAT Number",
             id="satcatid-filter-dropdown",
             className="mb-3",
@@ -6,10 +6,13 @@ from dash import dcc, html
 import dash_bootstrap_components as dbc
 
 
-def create_status_filter():
+def create_status_filter(value=None):
     """
     Create the status filter component (Active/Inactive).
 
+    Args:
+        value (list): Initially selected statuses (default: Active)
+
     Returns:
         html.Div: Status filter component
     """
@@ -30,7 +33,7 @@ def create_status_filter():
                 {"label": " Active", "value": "Active"},
                 {"label": " Inactive", "value": "Inactive"}
             ],
-            value=["Active"],
+            value=["Active"] if value is None else value,
             id="status-filter-checkbox",
             className="mb-3",
             inline=True,
@@ -15,6 +15,7 @@ Todo:
 
 ## Packages
 import sys
+import uuid
 from dash import dcc
 import dash_bootstrap_components as dbc
 
@@ -23,6 +24,8 @@ sys.path.append("../../")
 
 # app data
 from app.core.state import get_app_data
+# app functions
+from app.helper.helper__filter_query import parse_filter_query, create_default_filter_inputs
 
 # Layout components
 from app.layouts.components.header import create_header
@@ -31,12 +34,14 @@ from app.layouts.components.visualization_area import create_visualization_area
 
 
 ## --- Define Dash layout ----
-def create_dash_layout(app):
+def create_dash_layout(app, search=None):
     """
     Create the main Dash layout for satellite visualization page.
 
     Args:
         app: Dash application instance
+        search (str): URL query string with filter query or preset, e.g. "?preset=active-leo&year=2015-2025"
+            (optional - invalid queries fall back to the default filters)
 
     Returns:
         layout: Complete Dash layout
@@ -51,6 +56,13 @@ def create_dash_layout(app):
     fig3d_0 = app_data['viz_3d']['base_figure']    
     options = app_data['filter']['options']
 
+    # Initial filter values from URL filter query
+    try:
+        filter_inputs = parse_filter_query(search, options, app_data['filter']['presets'])
+    except ValueError as e:
+        print(f"Invalid filter query '{search}': {e}")
+        filter_inputs = create_default_filter_inputs(options)
+
     layout = dbc.Container([
         # Hidden store for viewport tracking
         dcc.Store(id='viewport-width', storage_type='session'),
@@ -62,6 +74,9 @@ def create_dash_layout(app):
         # Memory stores
         dcc.Store(id='3d-orbit-memory', data=[]),
         dcc.Store(id='camera-memory', data=fig3d_0["layout"]["scene"]["camera"]),
+        dcc.Store(id='3d-trace-count', data=len(fig3d_0.data)), # traces of 3d figure on client (see create_3d_figure_patch)
+        dcc.Store(id='2d-track-memory', data=None), # ground track samples held by 2d figure (see get_ground_track_update)
+        dcc.Store(id='session-id', data=str(uuid.uuid4())), # server-side filter state key
 
         # Header Section - Mobile Optimized
         create_header(tle_metadata),
@@ -69,7 +84,7 @@ def create_dash_layout(app):
         # Main Content Area
         dbc.Row([
             # Filters Sidebar - Collapsible on mobile
-            create_filter_sidebar(options),
+            create_filter_sidebar(options, filter_inputs),
 
             # Visualization Area
             create_visualization_area(fig3d_0, fig2d_0, tbl_col_map)
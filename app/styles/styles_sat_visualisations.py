@@ -48,6 +48,42 @@ colorscale_marker =[[0.0, colours["marker0"]],
 colorscale_markerpath =[[0.0, colours["markerpath0"]],
                     [1.0, colours["markerpath1"]]]
 
+## Hover label style for 3d markers and paths
+hoverlabel_3d = dict(
+    namelength=0,
+    font_family="Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif",
+    font_size=12,
+    font_color="white",
+    bgcolor="rgba(13, 15, 18, 0.95)",
+    bordercolor="#0dcaf0",
+    align="left"
+)
+
+## Hover text templates for 3d markers and paths - satellite metadata (orbit path hover), further details and
+## position (marker hover = metadata + details + position)
+hovertext_3d = {
+    "metadata": (
+        '<b style="font-size: 14px; background: linear-gradient(90deg, #00ff88 0%, #0dcaf0 100%); '
+        '-webkit-background-clip: text; -webkit-text-fill-color: transparent; '
+        'background-clip: text; color: #0dcaf0;">{ObjectName}</b><br>'
+        '<span style="color: rgba(173, 181, 189, 0.6);">━━━━━━━━━━━━━━━</span><br>'
+        '<b>ID:</b> <span style="color: rgba(255, 255, 255, 0.9);">{SatCatId}</span><br>'
+        '<b>Status:</b> <span style="color: {status_color};">●</span> '
+        '<span style="color: {status_color};">{Status}</span><br>'
+        '<b>Orbit:</b> <span style="color: rgba(255, 255, 255, 0.9);">{OrbitClass}</span><br>'
+    ),
+    "details": (
+        '<b>Launch:</b> <span style="color: rgba(255, 255, 255, 0.9);">{LaunchYear}</span><br>'
+        '<b>Owner:</b> <span style="color: rgba(255, 255, 255, 0.9);">{Owner}</span><br>'
+        '<span style="color: rgba(173, 181, 189, 0.6);">━━━━━━━━━━━━━━━</span><br>'
+        '<b>Position:</b><br>'
+    ),
+    "position": (
+        '<span style="color: rgba(108, 117, 125, 0.8); font-size: 11px;">  '
+        'Lat: {lat}° | Lon: {lon}° | Alt: {alt}km</span>'
+    )
+}
+
 
 # Styles
 
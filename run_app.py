@@ -24,7 +24,11 @@ import pandas as pd
 from dash import Dash
 from dash import Dash, html, dcc, page_registry, page_container
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+
+# Copy-on-write - the shared satellite catalogue is read concurrently by callbacks on the server's worker threads;
+# arrays read from it are read-only views and derived frames can never write back into it
+pd.set_option("mode.copy_on_write", True)
 
 ## Internal Modules
 
@@ -81,7 +85,7 @@ app.index_string = """<!DOCTYPE html>
 
 ## >>>>>>>> Initialize App Data <<<<<<<<<<<<
 
-# Initialize app data (satellite catalog, filters, visualization configs)
+# Initialize app data (satellite catalog, filters, visualization configs) - at import, before server threads start
 app_data = get_app_data()
 
 # Create persistent navigation bar
@@ -105,14 +109,16 @@ register_all_callbacks(app)
 
 @app.callback(
     Output('page-content', 'children'),
-    Input('url', 'pathname')
+    Input('url', 'pathname'),
+    State('url', 'search')
 )
-def display_page(pathname):
+def display_page(pathname, search):
     """
     Route URL pathname to appropriate page layout.
 
     Args:
         pathname (str): URL pathname from dcc.Location
+        search (str): URL query string from dcc.Location (filter query, e.g. ?preset=active-leo)
 
     Returns:
         Dash component: Page layout corresponding to pathname
@@ -122,7 +128,7 @@ def display_page(pathname):
         /sat_visualisation - Live satellite tracking (3D/2D/Table)
     """
     if pathname == '/sat_visualisation':
-        return create_dash_layout_sat_visualisations(app)
+        return create_dash_layout_sat_visualisations(app, search)
     else:
         return create_dash_layout_home(app)
 
@@ -27,10 +27,14 @@ Todo:
 
 ## Packages
 
+import pandas as pd
 from dash import Dash, html, dcc, page_registry, page_container
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 
+# Copy-on-write - the shared satellite catalogue is read concurrently by callbacks on the server's worker threads;
+# arrays read from it are read-only views and derived frames can never write back into it
+pd.set_option("mode.copy_on_write", True)
 
 ## Internal Modules
 
@@ -66,7 +70,7 @@ app = Dash(
 # Reference underlying Flask server (for production deployment)
 server = app.server
 
-# Initialize app data (satellite catalog, filters, visualization configs)
+# Initialize app data (satellite catalog, filters, visualization configs) - at import, before server threads start
 app_data = get_app_data()
 
 # Create persistent navigation bar
@@ -91,14 +95,16 @@ register_all_callbacks(app)
 
 @app.callback(
     Output('page-content', 'children'),
-    Input('url', 'pathname')
+    Input('url', 'pathname'),
+    State('url', 'search')
 )
-def display_page(pathname):
+def display_page(pathname, search):
     """
     Route URL pathname to appropriate page layout.
 
     Args:
         pathname (str): URL pathname from dcc.Location
+        search (str): URL query string from dcc.Location (filter query, e.g. ?preset=active-leo)
 
     Returns:
         Dash component: Page layout corresponding to pathname
@@ -109,7 +115,7 @@ def display_page(pathname):
         /sat_applications - Educational content about satellites
     """
     if pathname == '/sat_visualisation':
-        return create_dash_layout_sat_visualisations(app)
+        return create_dash_layout_sat_visualisations(app, search)
     else:
         return create_dash_layout_home(app)
 